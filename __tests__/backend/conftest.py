@@ -0,0 +1,73 @@
+"""
+Shared fixtures for the FastAPI backend (main.py) tests.
+
+Run with: python -m pytest __tests__/backend
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import httpx
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+# Everything main.py writes to disk goes to a scratch directory, and no periodic sweep runs.
+SCRATCH = tempfile.mkdtemp(prefix="targetym-tests-")
+os.environ["CANDIDATE_ARCHIVE_DIR"] = os.path.join(SCRATCH, "archive")
+os.environ["CV_STORAGE_DIR"] = os.path.join(SCRATCH, "cvs")
+os.environ["REMINDER_OUTBOX_PATH"] = os.path.join(SCRATCH, "outbox", "reminders.jsonl")
+os.environ["ARCHIVE_SWEEP_HOURS"] = "0"
+os.environ["ADMIN_API_TOKEN"] = "test-admin-token"
+# Off by default in main.py; on here so the tests run through it.
+os.environ["RATE_LIMIT_ENABLED"] = "1"
+
+import main  # noqa: E402
+
+ADMIN = {"X-Admin-Token": "test-admin-token"}
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client():
+    """An HTTP client on the app with its lifespan running and empty stores"""
+    if main.app.middleware_stack is None:
+        main.app.middleware_stack = main.app.build_middleware_stack()
+    for limiter in middleware_instances(main.RateLimitMiddleware):
+        limiter.limiter = main.TokenBucketLimiter(main.RATE_LIMITS)
+    # Cleared stores hand out ids and versions again, so cached ETag entries would go stale.
+    for compression in middleware_instances(main.CompressionMiddleware):
+        compression.cache = main.CompressedBodyCache(compression.cache.max_bytes)
+    async with main.lifespan(main.app):
+        main.tenants.default.clear()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as http:
+            yield http
+        for tenant in main.tenants:
+            tenant.clear()
+
+
+def candidate(n: int, **fields) -> dict:
+    return {"name": f"Candidate {n}", "email": f"candidate{n}@example.com", "phone": "+33600000000",
+            "position": "Backend Engineer", **fields}
+
+
+def middleware_instances(middleware_type) -> list:
+    """Instances of a middleware class in the app's built middleware stack"""
+    found, layer = [], main.app.middleware_stack
+    while layer is not None:
+        if isinstance(layer, middleware_type):
+            found.append(layer)
+        layer = getattr(layer, "app", None)
+    return found
+
+
+def find_middleware(middleware_type):
+    found = middleware_instances(middleware_type)
+    assert found, f"{middleware_type.__name__} is not installed"
+    return found[0]
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+import main
+from conftest import find_middleware
+
+pytestmark = pytest.mark.anyio
+
+
+def test_batch_lane_follows_its_most_demanding_sub_request():
+    controller = main.AdmissionController(app=None)
+
+    def lane(*items):
+        return controller.batch_lane(json.dumps({"requests": list(items)}).encode())
+
+    reads = [{"path": "/api/candidates?status=new"}, {"method": "GET", "path": "/api/analytics/recruitment"}]
+    assert lane(*reads) == "read"
+    assert lane(*reads, {"method": "PATCH", "path": "/api/candidates/1", "body": {}}) == "write"
+    assert lane(*reads, {"method": "POST", "path": "/api/candidates/bulk", "body": []}) == "bulk"
+    assert controller.batch_lane(b"not json") == "write"
+
+
+async def test_unmatched_paths_share_one_route_limiter(client):
+    for n in range(50):
+        assert (await client.get(f"/api/no-such-route-{n}")).status_code == 404
+    controller = find_middleware(main.AdmissionController)
+    assert sum(route == main.AdmissionController.UNMATCHED_ROUTE[1] for _, _, route in controller.route_limiters) == 1
+
+
+async def test_read_only_batch_is_admitted_as_a_read(client):
+    response = await client.post("/api/batch", json={"requests": [{"path": "/api/candidates"}, {"path": "/api/jobs"}]})
+    assert response.status_code == 200
+    controller = find_middleware(main.AdmissionController)
+    assert ("read", "POST", "/api/batch") in controller.route_limiters
+    assert ("bulk", "POST", "/api/batch") not in controller.route_limiters
@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import pytest
+
+import main
+from conftest import ADMIN, candidate
+
+pytestmark = pytest.mark.anyio
+
+ARCHIVE_NOW = "/api/admin/archive/candidates?older_than_days=0"
+
+
+async def create_rejected(client, n: int) -> str:
+    response = await client.post("/api/candidates", json=candidate(n, status="rejected"))
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def test_write_during_archiving_is_not_lost(client, monkeypatch):
+    candidate_id = await create_rejected(client, 1)
+    archive = main.tenants.default.archive
+    append = archive.append
+
+    def slow_append(*args):
+        time.sleep(0.2)  # a write arriving now must not slip in before the eviction
+        return append(*args)
+
+    monkeypatch.setattr(archive, "append", slow_append)
+    archiving = asyncio.ensure_future(client.post(ARCHIVE_NOW, headers=ADMIN))
+    await asyncio.sleep(0.05)
+    patch = await client.patch(f"/api/candidates/{candidate_id}", json={"status": "screening"})
+    assert (await archiving).json()["archived"] == 1
+
+    stored = (await client.get(f"/api/candidates/{candidate_id}")).json()
+    if patch.status_code == 200:
+        assert stored["status"] == "screening"
+    else:
+        assert patch.status_code == 409 and stored["status"] == "rejected"
+
+
+async def test_archiving_inside_a_batch_completes(client):
+    await create_rejected(client, 1)
+    batch = client.post("/api/batch", headers=ADMIN, json={"requests": [{"method": "POST", "path": ARCHIVE_NOW}]})
+    response = await asyncio.wait_for(batch, timeout=5)
+    result = response.json()["responses"][0]
+    assert result["status"] == 200 and result["body"]["archived"] == 1
+
+
+async def test_archived_candidate_can_be_erased(client):
+    kept, erased = await create_rejected(client, 1), await create_rejected(client, 2)
+    assert (await client.post(ARCHIVE_NOW, headers=ADMIN)).json()["archived"] == 2
+
+    assert (await client.put(f"/api/candidates/{erased}", json=candidate(2))).status_code == 409
+    assert (await client.delete(f"/api/candidates/{erased}", headers={"If-Match": '"1"'})).status_code == 412
+    assert (await client.delete(f"/api/candidates/{erased}")).status_code == 200
+    assert (await client.get(f"/api/candidates/{erased}")).status_code == 404
+    assert (await client.delete(f"/api/candidates/{erased}")).status_code == 404
+    # The erased record's email is free again; the other archived record is untouched.
+    assert (await client.post("/api/candidates", json=candidate(2))).status_code == 201
+    assert (await client.get(f"/api/candidates/{kept}")).json()["email"] == candidate(1)["email"]
+
+    assert (await client.delete(f"/api/candidates/{kept}")).status_code == 200
+    assert not main.tenants.default.archive.segments
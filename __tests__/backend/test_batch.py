@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from conftest import candidate
+
+pytestmark = pytest.mark.anyio
+
+
+async def batch(client, *items, **kwargs):
+    response = await client.post("/api/batch", json={"requests": list(items)}, **kwargs)
+    assert response.status_code == 200
+    return response.json()["responses"]
+
+
+async def test_percent_encoded_paths_route_like_direct_requests(client):
+    created = (await client.post("/api/candidates", json=candidate(2))).json()
+    encoded = "/api/candidates/" + "".join(f"%{ord(c):02X}" for c in created["id"])
+    assert (await client.get(encoded)).status_code == 200
+
+    [result] = await batch(client, {"path": encoded})
+    assert result["status"] == 200
+    assert result["body"]["id"] == created["id"]
+
+
+async def test_encoded_batch_path_is_refused_inside_a_batch(client):
+    response = await client.post("/api/batch", json={"requests": [{"method": "POST", "path": "/api/%62atch"}]})
+    assert response.status_code == 400
+
+
+async def test_item_headers_replace_the_envelope_copies(client):
+    created = await client.post("/api/candidates", json=candidate(1))
+    current = created.headers["etag"]
+    patch = {"method": "PATCH", "path": f"/api/candidates/{created.json()['id']}", "body": {"status": "screening"},
+             "headers": {"If-Match": current}}
+
+    # The envelope's stale If-Match must not shadow the item's own.
+    [result] = await batch(client, patch, headers={"If-Match": '"999"'})
+    assert result["status"] == 200, json.dumps(result)
+    assert result["body"]["status"] == "screening"
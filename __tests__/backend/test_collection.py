@@ -0,0 +1,151 @@
+import random
+
+import main
+
+
+def brute_filter(collection, **criteria):
+    return [record for record in collection
+            if all(record.get(field) == value for field, value in criteria.items() if value is not None)]
+
+
+def test_filter_returns_insertion_order_after_updates():
+    rng = random.Random(7)
+    statuses = ["new", "screening", "interview", "rejected"]
+    collection = main.Collection("candidates", indexed=("status", "position"))
+    for n in range(3_000):
+        collection.insert({"status": rng.choice(statuses), "position": rng.choice("ab")})
+    for _ in range(3_000):
+        record_id = str(rng.randint(1, 3_000))
+        if record_id not in collection:
+            continue
+        if rng.random() < 0.2:
+            collection.delete(record_id)
+        else:
+            collection.patch(record_id, {"status": rng.choice(statuses)})
+
+    for status in statuses + [None]:
+        for position in ("a", "b", None):
+            expected = brute_filter(collection, status=status, position=position)
+            assert collection.filter(status=status, position=position) == expected
+            assert collection.filter(limit=25, status=status, position=position) == expected[:25]
+            assert collection.count(status=status, position=position) == len(expected)
+
+
+def overlaps_brute(record, lo, hi) -> bool:
+    """A missing end is unbounded; a record with neither end never overlaps"""
+    low, high = record.get("salary_min"), record.get("salary_max")
+    if low is None and high is None:
+        return False
+    if low is not None and high is not None:
+        low, high = min(low, high), max(low, high)
+    return (low is None or low <= hi) and (high is None or high >= lo)
+
+
+def test_interval_filter_matches_a_scan():
+    rng = random.Random(49)
+    jobs = main.Collection("jobs", indexed=("status",), intervals={"salary": ("salary_min", "salary_max")})
+
+    def salary_range():
+        low = rng.randrange(20_000, 150_000)
+        shape = rng.random()
+        if shape < 0.1:
+            return {"salary_min": None, "salary_max": None}
+        if shape < 0.2:
+            return {"salary_min": low, "salary_max": None}
+        if shape < 0.3:
+            return {"salary_min": None, "salary_max": low}
+        return {"salary_min": low, "salary_max": low + rng.randrange(60_000)}
+
+    for _ in range(5_000):
+        jobs.insert({"status": rng.choice(["published", "draft"]), **salary_range()})
+    # A few very wide postings, which must not widen every query's window.
+    for low in (0, 10_000, 90_000):
+        jobs.insert({"status": "published", "salary_min": low, "salary_max": 5_000_000})
+    for _ in range(3_000):
+        record_id = str(rng.randint(1, 5_000))
+        if record_id not in jobs:
+            continue
+        if rng.random() < 0.2:
+            jobs.delete(record_id)
+        else:
+            jobs.patch(record_id, salary_range())
+
+    for _ in range(100):
+        lo = rng.randrange(0, 200_000)
+        hi = lo + rng.randrange(80_000)
+        status = rng.choice(["published", None])
+        expected = [record for record in brute_filter(jobs, status=status) if overlaps_brute(record, lo, hi)]
+        assert jobs.filter(overlaps={"salary": (lo, hi)}, status=status) == expected
+        assert jobs.filter(limit=10, overlaps={"salary": (lo, hi)}, status=status) == expected[:10]
+
+
+def test_wide_outlier_does_not_turn_queries_into_scans():
+    jobs = main.Collection("jobs", intervals={"salary": ("salary_min", "salary_max")})
+    for n in range(100_000):
+        low = 30_000 + n * 2
+        jobs.insert({"salary_min": low, "salary_max": low + 10_000})
+    outlier = jobs.insert({"salary_min": 0, "salary_max": 5_000_000})["id"]
+    index = jobs._intervals["salary"]
+
+    # Before, the window ran from 150_000 - 5_000_000: every posting.
+    assert index.estimate(150_000, 151_000) < len(jobs) // 10
+    ids = jobs.filter(overlaps={"salary": (150_000, 151_000)})
+    assert outlier in [record["id"] for record in ids]
+    assert len(ids) == sum(overlaps_brute(record, 150_000, 151_000) for record in jobs)
+    assert [r["id"] for r in jobs.filter(limit=3, overlaps={"salary": (150_000, 151_000)})] == \
+        [r["id"] for r in ids[:3]]
+
+
+def test_open_ended_postings_match_any_salary_past_their_bound():
+    jobs = main.Collection("jobs", intervals={"salary": ("salary_min", "salary_max")})
+    from_100k = jobs.insert({"salary_min": 100_000, "salary_max": None})["id"]
+    up_to_60k = jobs.insert({"salary_min": None, "salary_max": 60_000})["id"]
+    jobs.insert({"salary_min": None, "salary_max": None})
+
+    def matching(lo, hi):
+        return [record["id"] for record in jobs.filter(overlaps={"salary": (lo, hi)})]
+
+    assert matching(120_000, 130_000) == [from_100k]
+    assert matching(10_000, 20_000) == [up_to_60k]
+    assert matching(60_000, 100_000) == [from_100k, up_to_60k]
+    assert matching(70_000, 90_000) == []
+
+
+def test_facet_counts_match_a_scan():
+    rng = random.Random(50)
+    values = {"status": ["published", "draft", "closed"], "department": [f"d{n}" for n in range(12)],
+              "location": ["Paris", "Remote", "Dakar", None], "type": ["full-time", "contract"]}
+    jobs = main.Collection("jobs", indexed=tuple(values), intervals={"salary": ("salary_min", "salary_max")})
+    for _ in range(5_000):
+        low = rng.randrange(20_000, 150_000)
+        jobs.insert({**{field: rng.choice(choices) for field, choices in values.items()},
+                     "salary_min": low, "salary_max": low + rng.randrange(40_000)})
+    for _ in range(2_000):
+        record_id = str(rng.randint(1, 5_000))
+        if record_id not in jobs:
+            continue
+        if rng.random() < 0.3:
+            jobs.delete(record_id)
+        else:
+            jobs.patch(record_id, {"status": rng.choice(values["status"]),
+                                   "location": rng.choice(values["location"])})
+
+    fields = tuple(values)
+    for _ in range(60):
+        criteria = {field: rng.choice(choices + [None, None]) for field, choices in values.items()}
+        overlaps = {"salary": (60_000, 90_000)} if rng.random() < 0.5 else None
+        total, facets = jobs.facet_counts(fields, overlaps=overlaps, **criteria)
+
+        def matching(excluded=None):
+            others = {field: value for field, value in criteria.items() if field != excluded}
+            return [record for record in brute_filter(jobs, **others)
+                    if overlaps is None or overlaps_brute(record, *overlaps["salary"])]
+
+        assert total == len(matching())
+        for field in fields:
+            # A facet's own criterion is left out of its counts.
+            expected = {}
+            for record in matching(excluded=field):
+                if record[field] is not None:
+                    expected[record[field]] = expected.get(record[field], 0) + 1
+            assert {value: count for value, count in facets[field].items() if count} == expected
@@ -0,0 +1,30 @@
+import pytest
+
+from conftest import candidate
+
+pytestmark = pytest.mark.anyio
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+async def test_large_creates_are_not_served_from_each_others_cache(client):
+    created = []
+    for n in (1, 2):
+        response = await client.post("/api/candidates", json=candidate(n, notes="x" * 2048), headers=GZIP)
+        assert response.status_code == 201
+        assert response.headers["content-encoding"] == "gzip"
+        created.append(response.json())
+    assert [person["name"] for person in created] == ["Candidate 1", "Candidate 2"]
+    assert created[0]["id"] != created[1]["id"]
+
+
+async def test_reads_reuse_the_compressed_body_until_the_record_changes(client):
+    record = (await client.post("/api/candidates", json=candidate(1, notes="x" * 2048))).json()
+    path = f"/api/candidates/{record['id']}"
+    first = await client.get(path, headers=GZIP)
+    again = await client.get(path, headers=GZIP)
+    assert first.headers["content-encoding"] == "gzip" and again.json() == first.json()
+
+    patched = await client.patch(path, json={"notes": "y" * 2048}, headers=GZIP)
+    assert patched.json()["notes"] == "y" * 2048
+    assert (await client.get(path, headers=GZIP)).json()["notes"] == "y" * 2048
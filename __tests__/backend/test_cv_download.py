@@ -0,0 +1,32 @@
+import pytest
+
+from conftest import candidate
+
+pytestmark = pytest.mark.anyio
+
+CV_TEXT = b"Backend engineer, Python and PostgreSQL. " * 500
+
+
+@pytest.fixture
+async def cv_url(client):
+    created = (await client.post("/api/candidates", json=candidate(1))).json()
+    url = f"/api/candidates/{created['id']}/cv"
+    assert (await client.post(url, files={"file": ("cv.txt", CV_TEXT, "text/plain")})).status_code == 202
+    return url
+
+
+async def test_cv_is_served_uncompressed_for_gzip_clients(client, cv_url):
+    response = await client.get(cv_url, headers={"Accept-Encoding": "gzip, br"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == str(len(CV_TEXT))
+    assert response.content == CV_TEXT
+
+
+async def test_range_and_if_range_address_the_stored_bytes(client, cv_url):
+    tag = (await client.get(cv_url)).headers["etag"]
+    response = await client.get(cv_url, headers={"Range": "bytes=100-199", "If-Range": tag,
+                                                 "Accept-Encoding": "gzip"})
+    assert response.status_code == 206
+    assert response.content == CV_TEXT[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(CV_TEXT)}"
@@ -0,0 +1,71 @@
+import pytest
+
+import main
+from conftest import ADMIN, candidate
+
+pytestmark = pytest.mark.anyio
+
+BOUNDARY = "cv-test-boundary"
+
+
+async def test_chunked_upload_stops_at_the_size_limit(client, monkeypatch):
+    monkeypatch.setattr(main, "CV_MAX_BYTES", 256 * 1024)
+    created = (await client.post("/api/candidates", json=candidate(1))).json()
+    chunk = b"x" * 64 * 1024
+    sent = 0
+
+    async def body():
+        # No Content-Length: httpx sends a generator body chunked.
+        nonlocal sent
+        yield (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"cv.txt\"\r\n"
+               f"Content-Type: text/plain\r\n\r\n").encode()
+        for _ in range(64):
+            sent += len(chunk)
+            yield chunk
+        yield f"\r\n--{BOUNDARY}--\r\n".encode()
+
+    response = await client.post(f"/api/candidates/{created['id']}/cv", content=body(),
+                                 headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"})
+    assert response.status_code == 413
+    assert sent <= main.CV_MAX_BYTES + main.CV_MULTIPART_OVERHEAD + len(chunk)
+    assert created["id"] not in main.tenants.default.cv_files
+
+
+async def test_upload_within_the_limit_is_accepted(client):
+    created = (await client.post("/api/candidates", json=candidate(1))).json()
+    files = {"file": ("cv.txt", b"Backend engineer, Python and PostgreSQL. " * 200, "text/plain")}
+    response = await client.post(f"/api/candidates/{created['id']}/cv", files=files)
+    assert response.status_code == 202
+    assert main.tenants.default.cv_files[created["id"]]["size"] == len(files["file"][1])
+
+
+async def upload(client, candidate_id: str, content: bytes) -> dict:
+    files = {"file": ("cv.txt", content, "text/plain")}
+    assert (await client.post(f"/api/candidates/{candidate_id}/cv", files=files)).status_code == 202
+    return main.tenants.default.cv_files[candidate_id]
+
+
+async def test_cv_files_are_unlinked_with_their_last_reference(client):
+    first, second = [(await client.post("/api/candidates", json=candidate(n))).json()["id"] for n in (1, 2)]
+    shared = await upload(client, first, b"Shared CV text. " * 100)
+    await upload(client, second, b"Shared CV text. " * 100)
+
+    replaced = await upload(client, first, b"A newer CV. " * 100)
+    assert replaced["path"] != shared["path"]
+    assert main.os.path.exists(shared["path"])  # still the second candidate's CV
+
+    assert (await client.delete(f"/api/candidates/{second}")).status_code == 200
+    assert not main.os.path.exists(shared["path"])
+    assert (await client.delete(f"/api/candidates/{first}")).status_code == 200
+    assert not main.os.path.exists(replaced["path"])
+    assert not main.tenants.default.cv_refs
+
+
+async def test_erasing_an_archived_candidate_unlinks_their_cv(client):
+    created = (await client.post("/api/candidates", json=candidate(1, status="rejected"))).json()["id"]
+    stored = await upload(client, created, b"Archived CV text. " * 100)
+    assert (await client.post("/api/admin/archive/candidates?older_than_days=0", headers=ADMIN)).json()["archived"] == 1
+    assert main.os.path.exists(stored["path"])
+
+    assert (await client.delete(f"/api/candidates/{created}")).status_code == 200
+    assert not main.os.path.exists(stored["path"])
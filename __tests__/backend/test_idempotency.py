@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import pytest
+
+import main
+from conftest import candidate
+
+pytestmark = pytest.mark.anyio
+
+
+def counting_app(delay: float = 0.0):
+    """A stand-in app answering each POST with a fresh id after delay seconds"""
+    calls = []
+
+    async def app(scope, receive, send):
+        body = await main.read_body(receive)
+        calls.append(body)
+        await asyncio.sleep(delay)
+        await send({"type": "http.response.start", "status": 201,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": json.dumps({"id": len(calls)}).encode()})
+    return app, calls
+
+
+async def call(middleware, body: bytes, key: str = "key-1", chunk: int = 0, content_length: bool = True):
+    headers = [(b"idempotency-key", key.encode()), (b"content-type", b"application/json")]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+    scope = {"type": "http", "method": "POST", "path": "/api/candidates", "query_string": b"", "headers": headers}
+    parts = [body[i:i + chunk] for i in range(0, len(body), chunk)] if chunk else [body]
+    messages = [{"type": "http.request", "body": part, "more_body": n < len(parts) - 1}
+                for n, part in enumerate(parts)]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+    start = sent[0]
+    return start["status"], dict(start["headers"]), b"".join(m.get("body", b"") for m in sent[1:])
+
+
+async def test_retry_replays_the_stored_response(client):
+    headers = {"Idempotency-Key": "create-1"}
+    first = await client.post("/api/candidates", json=candidate(1), headers=headers)
+    retry = await client.post("/api/candidates", json=candidate(1), headers=headers)
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert len(main.tenants.default.candidates) == 1
+
+
+async def test_reusing_a_key_for_a_different_body_is_rejected(client):
+    headers = {"Idempotency-Key": "create-2"}
+    assert (await client.post("/api/candidates", json=candidate(1), headers=headers)).status_code == 201
+    response = await client.post("/api/candidates", json=candidate(2), headers=headers)
+    assert response.status_code == 422
+    assert len(main.tenants.default.candidates) == 1
+
+
+async def test_concurrent_duplicates_wait_for_the_first_request():
+    app, calls = counting_app(delay=0.05)
+    middleware = main.IdempotencyMiddleware(app)
+    results = await asyncio.gather(*(call(middleware, b'{"name": "x"}') for _ in range(5)))
+    assert len(calls) == 1
+    assert {body for _, _, body in results} == {b'{"id": 1}'}
+    assert sum(headers.get(b"idempotent-replayed") == b"true" for _, headers, _ in results) == 4
+
+
+async def test_large_bulk_import_is_still_idempotent(client):
+    people = [candidate(n, notes="x" * 200) for n in range(5000)]
+    assert len(json.dumps(people)) > 1024 * 1024
+    headers = {"Idempotency-Key": "bulk-1"}
+    first = await client.post("/api/candidates/bulk", json=people, headers=headers)
+    retry = await client.post("/api/candidates/bulk", json=people, headers=headers)
+    assert first.status_code == 200 and first.json()["created"] == 5000
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert len(main.tenants.default.candidates) == 5000
+
+
+async def test_keyed_bodies_over_the_limit_are_refused():
+    app, calls = counting_app()
+    middleware = main.IdempotencyMiddleware(app, max_body=1024)
+    body = b"x" * 4096
+    assert (await call(middleware, body))[0] == 413
+    # Chunked, with no Content-Length: refused once the limit is passed, not buffered whole.
+    assert (await call(middleware, body, key="key-2", chunk=512, content_length=False))[0] == 413
+    assert calls == []
+    assert (await call(middleware, b"x" * 1024, key="key-3", chunk=512, content_length=False))[0] == 201
+
+
+async def test_entries_expire_after_the_ttl():
+    app, calls = counting_app()
+    middleware = main.IdempotencyMiddleware(app, ttl=0.05)
+    await call(middleware, b"{}")
+    await call(middleware, b"{}")
+    assert len(calls) == 1
+    await asyncio.sleep(0.06)
+    await call(middleware, b"{}")
+    assert len(calls) == 2
+
+
+async def test_store_evicts_oldest_entries_past_its_bounds():
+    store = main.IdempotencyStore(ttl=3600, max_entries=3, max_bytes=10)
+    for n in range(4):
+        store.complete(f"k{n}", store.begin(f"k{n}", "fp"), (201, [], b"1"))
+    assert store.get("k0") is None and store.get("k3") is not None
+
+    store.complete("big", store.begin("big", "fp"), (201, [], b"x" * 9))
+    # "big" pushes k1 out by count, then k2 by bytes.
+    assert [key for key in ("k1", "k2", "k3", "big") if store.get(key)] == ["k3", "big"]
+    assert store.size == 10
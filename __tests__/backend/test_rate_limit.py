@@ -0,0 +1,52 @@
+import pytest
+
+import main
+from conftest import candidate
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_batch_sub_requests_are_charged_to_their_own_category(client):
+    create_budget = main.RATE_LIMITS["create"][0]
+    for n in range(create_budget):
+        assert (await client.post("/api/candidates", json=candidate(n))).status_code == 201
+    assert (await client.post("/api/candidates", json=candidate(create_budget))).status_code == 429
+
+    for attempt in range(3):
+        items = [{"method": "POST", "path": "/api/candidates", "body": candidate(1000 + attempt * 10 + n)}
+                 for n in range(5)]
+        response = await client.post("/api/batch", json={"requests": items})
+        assert response.status_code == 200
+        assert [item["status"] for item in response.json()["responses"]] == [429] * 5
+    assert len(main.tenants.default.candidates) == create_budget
+
+    # Reads in a batch draw on the read budget, which the creates above left untouched.
+    response = await client.post("/api/batch", json={"requests": [{"path": "/api/candidates?limit=1"}]})
+    assert response.json()["responses"][0]["status"] == 200
+
+
+async def test_analytics_reads_use_the_default_budget(client):
+    assert main.determine_rate_limit_type("GET", "/api/analytics/recruitment") == "default"
+    for _ in range(30):
+        response = await client.get("/api/analytics/recruitment")
+        assert response.status_code == 200
+    assert response.headers["x-ratelimit-limit"] == str(main.RATE_LIMITS["default"][0])
+
+
+def test_categories_mirror_action_rate_limits():
+    assert set(main.RATE_LIMITS) == {"default", "create", "bulk", "ai"}
+
+
+async def test_rejections_carry_cors_headers_and_preflights_are_free(client):
+    origin = {"Origin": "http://localhost:3000"}
+    preflight = {**origin, "Access-Control-Request-Method": "POST"}
+    for _ in range(main.RATE_LIMITS["default"][0] + 5):
+        response = await client.options("/api/candidates", headers=preflight)
+        assert response.status_code == 200
+        assert "x-ratelimit-limit" not in response.headers
+
+    for n in range(main.RATE_LIMITS["create"][0]):
+        await client.post("/api/candidates", json=candidate(n), headers=origin)
+    response = await client.post("/api/candidates", json=candidate(999), headers=origin)
+    assert response.status_code == 429
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
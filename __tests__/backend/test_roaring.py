@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+import main
+
+
+def fill(rng, universe: int, operations: int, hot=None):
+    """A RoaringBitmap and the set it should equal, after random adds and discards"""
+    bitmap, expected = main.RoaringBitmap(), set()
+    for _ in range(operations):
+        value = rng.randrange(*hot) if hot and rng.random() < 0.5 else rng.randrange(universe)
+        if rng.random() < 0.7:
+            bitmap.add(value)
+            expected.add(value)
+        else:
+            bitmap.discard(value)
+            expected.discard(value)
+    return bitmap, expected
+
+
+# Dense (bitmap containers), sparse (array containers), and one hot container that
+# crosses the array/bitmap threshold in both directions.
+SHAPES = [(150_000, 60_000, None), (5_000_000, 10_000, None), (200_000, 20_000, (70_000, 72_000))]
+
+
+@pytest.mark.parametrize("universe,operations,hot", SHAPES)
+def test_bitmap_behaves_like_a_set(universe, operations, hot):
+    rng = random.Random(universe)
+    bitmap, expected = fill(rng, universe, operations, hot)
+    assert len(bitmap) == len(expected)
+    assert list(bitmap) == sorted(expected)
+    for value in rng.sample(range(universe), 2_000):
+        assert (value in bitmap) == (value in expected)
+
+    for other_shape in SHAPES:
+        other, other_expected = fill(rng, *other_shape[:2], other_shape[2])
+        assert list(bitmap & other) == sorted(expected & other_expected)
+        assert bitmap.intersection_count(other) == len(expected & other_expected)
+        assert other.intersection_count(bitmap) == len(expected & other_expected)
+
+    for value in list(expected):
+        bitmap.discard(value)
+    assert len(bitmap) == 0 and list(bitmap) == []
@@ -0,0 +1,137 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+from conftest import candidate
+
+pytestmark = pytest.mark.anyio
+
+
+def soon(seconds: float) -> str:
+    return (datetime.now() + timedelta(seconds=seconds)).isoformat()
+
+
+def job(**fields) -> dict:
+    return {"title": "Backend Engineer", "department": "Engineering", "location": "Paris", "type": "full-time",
+            "description": "Build the API", "requirements": ["Python"], **fields}
+
+
+async def status_of(client, job_id: str) -> str:
+    return (await client.get(f"/api/jobs/{job_id}")).json()["status"]
+
+
+async def active_jobs(client) -> int:
+    return (await client.get("/api/analytics/recruitment")).json()["active_jobs"]
+
+
+async def test_scheduled_posting_is_published_then_closed(client):
+    created = (await client.post("/api/jobs", json=job(status="scheduled", published_at=soon(0.1),
+                                                       expires_at=soon(0.4)))).json()
+    assert await active_jobs(client) == 0
+    await asyncio.sleep(0.25)
+    assert await status_of(client, created["id"]) == "published"
+    assert await active_jobs(client) == 1
+    await asyncio.sleep(0.3)
+    assert await status_of(client, created["id"]) == "closed"
+    assert await active_jobs(client) == 0
+
+
+@pytest.mark.parametrize("expiry_offset", [0.0, -0.05])
+async def test_expiry_at_or_before_publication_closes_without_publishing(client, expiry_offset):
+    transitions = main.tenants.default.publication.transitions
+    published_before = transitions["published"]
+    published_at = datetime.now() + timedelta(seconds=0.1)
+    created = (await client.post("/api/jobs", json=job(
+        status="scheduled", published_at=published_at.isoformat(),
+        expires_at=(published_at + timedelta(seconds=expiry_offset)).isoformat()))).json()
+    await asyncio.sleep(0.3)
+    assert await status_of(client, created["id"]) == "closed"
+    assert transitions["published"] == published_before
+
+
+async def test_rescheduling_and_cancelling_through_updates(client):
+    created = (await client.post("/api/jobs", json=job(status="scheduled", published_at=soon(0.1)))).json()
+    path = f"/api/jobs/{created['id']}"
+
+    # PATCH moves the publication later.
+    assert (await client.patch(path, json={"published_at": soon(0.4)})).status_code == 200
+    await asyncio.sleep(0.2)
+    assert await status_of(client, created["id"]) == "scheduled"
+    await asyncio.sleep(0.35)
+    assert await status_of(client, created["id"]) == "published"
+
+    # PUT back to a draft cancels the pending expiry.
+    assert (await client.patch(path, json={"expires_at": soon(0.2)})).status_code == 200
+    assert (await client.put(path, json=job(status="draft", expires_at=soon(0.2)))).status_code == 200
+    await asyncio.sleep(0.35)
+    assert await status_of(client, created["id"]) == "draft"
+    assert main.scheduler.deadline(("job-expire", "default", created["id"])) is None
+
+
+def interview(candidate_id: str, starts_in: timedelta, **fields) -> dict:
+    return {"candidate_id": candidate_id, "type": "technical", "scheduled_at": (datetime.now() + starts_in).isoformat(),
+            "duration": 60, "interviewers": ["alice@example.com"], **fields}
+
+
+@pytest.fixture
+async def reminders(client, monkeypatch):
+    """Reminder events published to the outbox, and a candidate to schedule interviews with"""
+    events = []
+    monkeypatch.setattr(main.reminder_outbox, "publish", events.append)
+    candidate_id = (await client.post("/api/candidates", json=candidate(1))).json()["id"]
+    return events, candidate_id
+
+
+def reminder_keys(interview_id: str) -> dict:
+    keys = {lead: ("interview-reminder", "default", interview_id, lead) for lead in main.INTERVIEW_REMINDER_MINUTES}
+    return {lead: main.scheduler.deadline(key) for lead, key in keys.items()}
+
+
+async def test_missed_lead_times_collapse_into_one_reminder(client, reminders):
+    events, candidate_id = reminders
+    shortest = min(main.INTERVIEW_REMINDER_MINUTES)
+    created = (await client.post("/api/interviews", json=interview(
+        candidate_id, timedelta(minutes=shortest + 5)))).json()
+
+    # Every lead but the shortest has passed: one of them fires now, the shortest stays timed.
+    deadlines = reminder_keys(created["id"])
+    assert deadlines[shortest] is not None
+    assert sum(deadline is not None for deadline in deadlines.values()) == 2
+    await asyncio.sleep(0.05)
+    assert [event["lead_minutes"] for event in events] == [max(main.INTERVIEW_REMINDER_MINUTES)]
+
+    late = (await client.post("/api/interviews", json=interview(candidate_id, timedelta(minutes=1)))).json()
+    await asyncio.sleep(0.05)
+    assert [event["interview_id"] for event in events].count(late["id"]) == 1
+
+
+async def test_reminders_are_cancelled_by_status_change_and_delete(client, reminders):
+    events, candidate_id = reminders
+    first = (await client.post("/api/interviews", json=interview(candidate_id, timedelta(days=3)))).json()
+    second = (await client.post("/api/interviews", json=interview(candidate_id, timedelta(days=3)))).json()
+    assert all(reminder_keys(first["id"]).values())
+
+    await client.patch(f"/api/interviews/{first['id']}", json={"status": "cancelled"})
+    assert not any(reminder_keys(first["id"]).values())
+
+    # Deleting the candidate deletes their interviews, and with them the timers.
+    assert all(reminder_keys(second["id"]).values())
+    await client.delete(f"/api/candidates/{candidate_id}")
+    assert not any(reminder_keys(second["id"]).values())
+    assert events == []
+
+
+async def test_reminder_ids_are_deterministic(client, reminders):
+    events, candidate_id = reminders
+    created = (await client.post("/api/interviews", json=interview(candidate_id, timedelta(days=3)))).json()
+    for _ in range(2):
+        main.tenants.default.reminders.fire(created["id"], 60)
+    assert len(events) == 2 and events[0]["id"] == events[1]["id"]
+
+    # Rescheduling the interview yields a new id for the same lead.
+    later = (datetime.now() + timedelta(days=4)).isoformat()
+    await client.patch(f"/api/interviews/{created['id']}", json={"scheduled_at": later})
+    main.tenants.default.reminders.fire(created["id"], 60)
+    assert events[2]["id"] != events[0]["id"]
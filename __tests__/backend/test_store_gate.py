@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+import main
+
+pytestmark = pytest.mark.anyio
+
+
+async def staggered(gate_context, starts, hold: float, log: list, label: str):
+    async def one(start):
+        await asyncio.sleep(start)
+        async with gate_context():
+            log.append(label)
+            await asyncio.sleep(hold)
+    await asyncio.gather(*(one(start) for start in starts))
+
+
+async def test_queued_write_is_not_starved_by_overlapping_read_batches():
+    gate = main.StoreGate()
+    log = []
+
+    async def write():
+        await asyncio.sleep(0.01)
+        async with gate.write():
+            log.append("write")
+
+    # Each read batch overlaps the next, so the gate never falls idle on its own.
+    reads = staggered(gate.snapshot, [0.02 * n for n in range(10)], 0.05, log, "read")
+    await asyncio.wait_for(asyncio.gather(reads, write()), timeout=2)
+    assert log.index("write") == 1
+
+
+async def test_queued_batch_is_not_starved_by_steady_writes():
+    gate = main.StoreGate()
+    log = []
+
+    async def batch():
+        await asyncio.sleep(0.01)
+        async with gate.snapshot(exclusive=True):
+            log.append("batch")
+
+    writes = staggered(gate.write, [0.02 * n for n in range(10)], 0.05, log, "write")
+    await asyncio.wait_for(asyncio.gather(writes, batch()), timeout=2)
+    assert log.index("batch") == 1
@@ -0,0 +1,32 @@
+import pytest
+
+import main
+from conftest import candidate
+
+pytestmark = pytest.mark.anyio
+
+
+def org(org_id: str) -> dict:
+    return {"X-Organization-Id": org_id}
+
+
+async def test_new_organizations_stop_at_the_bound(client, monkeypatch):
+    registry = main.TenantRegistry(max_tenants=3)
+    monkeypatch.setattr(main, "tenants", registry)
+    for n in range(2):
+        assert (await client.post("/api/candidates", json=candidate(n), headers=org(f"org-{n}"))).status_code == 201
+    assert (await client.post("/api/candidates", json=candidate(9), headers=org("org-9"))).status_code == 503
+    assert len(registry) == 3
+
+    # Known organizations keep working, and reads never open a tenant.
+    assert (await client.post("/api/candidates", json=candidate(5), headers=org("org-0"))).status_code == 201
+    assert (await client.get("/api/candidates", headers=org("org-10"))).json() == []
+    assert len(registry) == 3
+
+
+async def test_allow_list_refuses_other_organizations(client, monkeypatch):
+    monkeypatch.setattr(main, "tenants", main.TenantRegistry(allowed=frozenset({"acme"})))
+    assert (await client.post("/api/candidates", json=candidate(1), headers=org("acme"))).status_code == 201
+    assert (await client.post("/api/candidates", json=candidate(2))).status_code == 201
+    assert (await client.post("/api/candidates", json=candidate(3), headers=org("other"))).status_code == 403
+    assert (await client.get("/api/candidates", headers=org("other"))).status_code == 403
@@ -2,32 +2,320 @@
 TargetYM - FastAPI Backend
 Main application entry point
 """
-from fastapi import FastAPI, HTTPException
+import time
+
+STARTUP_STARTED = time.perf_counter()  # before any framework import, for the startup timing report
+
+from fastapi import Body, Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, EmailStr
-from typing import List, Optional
-from datetime import datetime
-import uvicorn
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, EmailStr, TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders, UploadFile
+from starlette.routing import Match, Route
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from array import array
+from collections import Counter, OrderedDict, deque
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, nullcontext
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from itertools import islice
+from typing_extensions import TypedDict
+from urllib.parse import quote, unquote, urlsplit
+import argparse
+import asyncio
+import bisect
+import hashlib
+import heapq
+import hmac
+import importlib.util
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import operator
+import os
+import re
+import secrets
+import struct
+import sys
+import tempfile
+import threading
+import weakref
+import xml.etree.ElementTree as ElementTree
+import zipfile
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+@lru_cache(maxsize=None)
+def optional_import(name: str):
+    """Import a rarely used optional dependency on first use; None when it is not installed.
+
+    numpy (status history analytics) and pypdf (CV extraction, in worker processes)
+    each add ~100 ms to a cold start, so they are not imported with the app.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def module_available(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+# Milliseconds spent in each phase of starting the server, reported by /api/admin/startup.
+startup_phases: Dict[str, float] = {}
+_phase_started = STARTUP_STARTED
+
+
+def end_phase(name: str):
+    global _phase_started
+    now = time.perf_counter()
+    startup_phases[name] = round((now - _phase_started) * 1000, 2)
+    _phase_started = now
+
+
+end_phase("imports")
+
+# Startup and shutdown work registered by the sections below; shutdown runs in reverse.
+startup_hooks: List[Callable[[], Any]] = []
+shutdown_hooks: List[Callable[[], Any]] = []
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for hook in startup_hooks:
+        started = time.perf_counter()
+        await hook()
+        startup_phases[f"startup:{hook.__qualname__}"] = round((time.perf_counter() - started) * 1000, 2)
+    startup_phases["ready_after"] = round((time.perf_counter() - STARTUP_STARTED) * 1000, 2)
+    try:
+        yield
+    finally:
+        for hook in reversed(shutdown_hooks):
+            await hook()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="TargetYM API",
     description="Backend API for TargetYM Recruitment Platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# CORS Configuration for Next.js
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://localhost:3001",
-        "https://*.vercel.app"
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# ==================== Response Compression ====================
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/xml", "text/", "image/svg+xml")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q-values"""
+    supported = ("br", "gzip") if brotli is not None else ("gzip",)
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class _StreamCompressor:
+    """Incremental gzip/brotli encoder that flushes after every chunk"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=level)
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(chunk) + self._brotli.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies bounded by total size in bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: tuple, body: bytes):
+        if len(body) > self.max_bytes // 8:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
+class CompressionMiddleware:
+    """Negotiated gzip/brotli compression for buffered and streamed responses.
+
+    Bodies under minimum_size are sent as-is. Buffered bodies are compressed once
+    and cached by ETag for GET/HEAD (or by content digest otherwise), so repeated
+    responses with identical payloads are served from the cache. Streamed bodies
+    are compressed chunk by chunk as they are produced.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+                 cache_bytes: int = 32 * 1024 * 1024, threadpool_size: int = 256 * 1024,
+                 partition_header: Optional[str] = None):
+        self.app = app
+        self.partition_header = partition_header
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+        self.cache = CompressedBodyCache(cache_bytes)
+        self.threadpool_size = threadpool_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        stream: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, stream, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                if not passthrough and stream is None:
+                    # Zero-copy sends (pathsend, zerocopysend) carry the body themselves.
+                    passthrough = True
+                    await send(start_message)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if stream is not None:
+                chunk = stream.compress(body) if body else b""
+                if not more_body:
+                    chunk += stream.finish()
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            if not self._should_compress(start_message["status"], headers, body, more_body):
+                passthrough = True
+                if "content-encoding" not in headers:
+                    headers.add_vary_header("Accept-Encoding")
+                await send(start_message)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+                stream = _StreamCompressor(encoding, self.levels[encoding])
+                await send(start_message)
+                await send({"type": "http.response.body", "body": stream.compress(body), "more_body": True})
+                return
+
+            compressed = await self._compress_cached(scope, start_message["status"], headers, body, encoding)
+            headers["Content-Length"] = str(len(compressed))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, status: int, headers: MutableHeaders, body: bytes, more_body: bool) -> bool:
+        if status < 200 or status in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        # A range-capable response is served as the stored bytes: its byte ranges and strong
+        # ETag describe those, and compressing it would buffer what is meant to stream.
+        if headers.get("accept-ranges", "none") != "none":
+            return False
+        content_type = headers.get("content-type", "")
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return False
+        return more_body or len(body) >= self.minimum_size
+
+    async def _compress_cached(self, scope, status: int, headers: MutableHeaders, body: bytes,
+                               encoding: str) -> bytes:
+        cacheable = "no-store" not in headers.get("cache-control", "")
+        key = None
+        if cacheable:
+            etag = headers.get("etag")
+            # Only a successful read is the representation its ETag names at that URL: a create
+            # or update answering on a collection path carries the new record's tag.
+            if etag and status == 200 and scope["method"] in READ_METHODS:
+                # ETags are only unique within a tenant, so the tenant is part of the key.
+                partition = Headers(scope=scope).get(self.partition_header) if self.partition_header else None
+                key = (encoding, partition, scope["path"], scope.get("query_string", b""), etag)
+            else:
+                key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if len(body) >= self.threadpool_size:
+            compressed = await run_in_threadpool(self._compress, body, encoding)
+        else:
+            compressed = self._compress(body, encoding)
+        if key is not None:
+            self.cache.put(key, compressed)
+        return compressed
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.levels["br"])
+        compressor = zlib.compressobj(self.levels["gzip"], zlib.DEFLATED, 31)
+        return compressor.compress(body) + compressor.flush()
+
 
 # ==================== Models ====================
 
@@ -42,6 +330,7 @@ class Candidate(BaseModel):
     cv_url: Optional[str] = None
     linkedin_url: Optional[str] = None
     notes: Optional[str] = None
+    cv_text: Optional[str] = None  # filled in from an uploaded CV
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -58,223 +347,3762 @@ class Interview(BaseModel):
     status: str = "scheduled"
     created_at: Optional[datetime] = None
 
+class CandidateWithInterviews(BaseModel):
+    candidate: Candidate
+    interviews: List[Interview]
+
 class JobPosting(BaseModel):
     id: Optional[str] = None
     title: str
     department: str
     location: str
     type: str  # full-time, part-time, contract
-    status: str = "draft"
+    status: str = "draft"  # draft, scheduled (published at published_at), published, closed
     description: str
     requirements: List[str]
     salary_min: Optional[int] = None
     salary_max: Optional[int] = None
     published_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None  # closed automatically once this passes
     created_at: Optional[datetime] = None
 
 # ==================== In-Memory Storage (Replace with DB later) ====================
 
-candidates_db = []
-interviews_db = []
-jobs_db = []
+Changes = Dict[str, Tuple[Any, Any]]
 
-# ==================== Routes ====================
 
-@app.get("/")
-async def root():
-    """API Health Check"""
-    return {
-        "status": "online",
-        "message": "TargetYM API is running",
-        "version": "1.0.0",
-        "docs": "/docs"
-    }
+class DuplicateKeyError(Exception):
+    """A write would give two records the same value for a unique field"""
 
-@app.get("/api/health")
-async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    def __init__(self, collection: str, field: str, existing_id: str):
+        super().__init__(f"{collection}.{field} must be unique (conflicts with {existing_id})")
+        self.collection = collection
+        self.field = field
+        self.existing_id = existing_id
 
-# ==================== Candidates Routes ====================
 
-@app.get("/api/candidates", response_model=List[Candidate])
-async def get_candidates(
-    status: Optional[str] = None,
-    position: Optional[str] = None,
-    limit: int = 100
-):
-    """Get all candidates with optional filtering"""
-    filtered = candidates_db
+class CompactRecord(MutableMapping):
+    """Dict-compatible record stored in fixed slots instead of a per-record hash table.
 
-    if status:
-        filtered = [c for c in filtered if c.get("status") == status]
-    if position:
-        filtered = [c for c in filtered if c.get("position") == position]
+    Subclasses are built by `compact_record_type`. Categorical fields are interned
+    so every record with the same status or department shares one string object.
+    """
 
-    return filtered[:limit]
+    __slots__ = ()
+    _fields: frozenset = frozenset()
+    _categorical: frozenset = frozenset()
+    _read_all: Callable[[Any], tuple] = staticmethod(lambda record: ())
 
-@app.post("/api/candidates", response_model=Candidate, status_code=201)
-async def create_candidate(candidate: Candidate):
-    """Create a new candidate"""
-    candidate_dict = candidate.model_dump()
-    candidate_dict["id"] = str(len(candidates_db) + 1)
-    candidate_dict["created_at"] = datetime.now()
-    candidate_dict["updated_at"] = datetime.now()
+    def __init__(self, fields=()):
+        fields = dict(fields)
+        unknown = fields.keys() - self._fields
+        if unknown:
+            raise KeyError(f"{type(self).__name__} has no field(s) {sorted(unknown)}")
+        for field in self._categorical.intersection(fields):
+            if type(fields[field]) is str:
+                fields[field] = sys.intern(fields[field])
+        for field, value in fields.items():
+            setattr(self, field, value)
 
-    candidates_db.append(candidate_dict)
-    return candidate_dict
+    def __getitem__(self, field: str):
+        if field in self._fields:
+            try:
+                return getattr(self, field)
+            except AttributeError:
+                pass
+        raise KeyError(field)
 
-@app.get("/api/candidates/{candidate_id}", response_model=Candidate)
-async def get_candidate(candidate_id: str):
-    """Get a specific candidate by ID"""
-    candidate = next((c for c in candidates_db if c["id"] == candidate_id), None)
-    if not candidate:
-        raise HTTPException(status_code=404, detail="Candidate not found")
-    return candidate
+    def get(self, field: str, default=None):
+        return getattr(self, field, default) if field in self._fields else default
 
-@app.put("/api/candidates/{candidate_id}", response_model=Candidate)
-async def update_candidate(candidate_id: str, candidate: Candidate):
-    """Update a candidate"""
-    idx = next((i for i, c in enumerate(candidates_db) if c["id"] == candidate_id), None)
-    if idx is None:
-        raise HTTPException(status_code=404, detail="Candidate not found")
+    def __setitem__(self, field: str, value):
+        if field not in self._fields:
+            raise KeyError(f"{type(self).__name__} has no field {field!r}")
+        if field in self._categorical and type(value) is str:
+            value = sys.intern(value)
+        setattr(self, field, value)
 
-    candidate_dict = candidate.model_dump()
-    candidate_dict["id"] = candidate_id
-    candidate_dict["updated_at"] = datetime.now()
+    def __delitem__(self, field: str):
+        try:
+            delattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
 
-    candidates_db[idx] = candidate_dict
-    return candidate_dict
+    def __iter__(self):
+        try:
+            self._read_all(self)
+        except AttributeError:
+            return (field for field in self.__slots__ if hasattr(self, field))
+        return iter(self.__slots__)
 
-@app.delete("/api/candidates/{candidate_id}")
-async def delete_candidate(candidate_id: str):
-    """Delete a candidate"""
-    idx = next((i for i, c in enumerate(candidates_db) if c["id"] == candidate_id), None)
-    if idx is None:
-        raise HTTPException(status_code=404, detail="Candidate not found")
+    def __len__(self) -> int:
+        try:
+            self._read_all(self)
+        except AttributeError:
+            return sum(1 for _ in self)
+        return len(self.__slots__)
 
-    candidates_db.pop(idx)
-    return {"message": "Candidate deleted successfully"}
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
 
-# ==================== Interviews Routes ====================
+    def to_dict(self) -> dict:
+        """Plain dict copy, read in one pass over the slots"""
+        try:
+            return dict(zip(self.__slots__, self._read_all(self)))
+        except AttributeError:
+            return dict(self)
 
-@app.get("/api/interviews", response_model=List[Interview])
-async def get_interviews(
-    candidate_id: Optional[str] = None,
-    status: Optional[str] = None
-):
-    """Get all interviews with optional filtering"""
-    filtered = interviews_db
 
-    if candidate_id:
-        filtered = [i for i in filtered if i.get("candidate_id") == candidate_id]
-    if status:
-        filtered = [i for i in filtered if i.get("status") == status]
+def record_dict(record: dict) -> dict:
+    """Plain dict copy of a stored record, compact or not"""
+    return record.to_dict() if isinstance(record, CompactRecord) else dict(record)
 
-    return filtered
 
-@app.post("/api/interviews", response_model=Interview, status_code=201)
-async def create_interview(interview: Interview):
-    """Schedule a new interview"""
-    interview_dict = interview.model_dump()
-    interview_dict["id"] = str(len(interviews_db) + 1)
-    interview_dict["created_at"] = datetime.now()
+def diff_records(previous: dict, record: dict) -> Changes:
+    """Fields whose values differ between two versions of a record, as (old, new)"""
+    if type(previous) is type(record) and isinstance(record, CompactRecord):
+        try:
+            pairs = zip(record.__slots__, record._read_all(previous), record._read_all(record))
+            return {field: (old, new) for field, old, new in pairs if old != new}
+        except AttributeError:
+            pass  # a slot is unset; fall back to comparing key by key
+    return {field: (previous.get(field), record.get(field))
+            for field in previous.keys() | record.keys()
+            if previous.get(field) != record.get(field)}
 
-    interviews_db.append(interview_dict)
-    return interview_dict
 
-@app.put("/api/interviews/{interview_id}", response_model=Interview)
-async def update_interview(interview_id: str, interview: Interview):
-    """Update an interview"""
-    idx = next((i for i, iv in enumerate(interviews_db) if iv["id"] == interview_id), None)
-    if idx is None:
-        raise HTTPException(status_code=404, detail="Interview not found")
+def value_bytes(value) -> int:
+    """Approximate memory owned by one field value; None and booleans are shared singletons"""
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(map(value_bytes, value))
+    return 0 if value is None or value is True or value is False else sys.getsizeof(value)
 
-    interview_dict = interview.model_dump()
-    interview_dict["id"] = interview_id
 
-    interviews_db[idx] = interview_dict
-    return interview_dict
+def compact_record_type(model: type, categorical: Tuple[str, ...] = ()) -> type:
+    """Slotted record class holding exactly the fields of a pydantic model"""
+    fields = tuple(model.model_fields)
+    return type(f"{model.__name__}Record", (CompactRecord,), {
+        "__slots__": fields,
+        "_fields": frozenset(fields),
+        "_categorical": frozenset(categorical),
+        "_read_all": staticmethod(operator.attrgetter(*fields)),
+    })
 
-# ==================== Job Postings Routes ====================
 
-@app.get("/api/jobs", response_model=List[JobPosting])
-async def get_jobs(
-    status: Optional[str] = None,
-    department: Optional[str] = None
-):
-    """Get all job postings with optional filtering"""
-    filtered = jobs_db
+# Members at which an array container turns into a bitmap. Roaring uses 4096, where
+# both take 8 KiB; here a member of an array costs a Python-level step in every
+# intersection against a word-wide int AND, so containers switch sooner.
+ARRAY_CONTAINER_MAX = 1024
 
-    if status:
-        filtered = [j for j in filtered if j.get("status") == status]
-    if department:
-        filtered = [j for j in filtered if j.get("department") == department]
 
-    return filtered
+def _bitmap_of(lows) -> int:
+    """A 65536-bit container holding the given low halves"""
+    bits = bytearray(8192)
+    for low in lows:
+        bits[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(bits, "little")
 
-@app.post("/api/jobs", response_model=JobPosting, status_code=201)
-async def create_job(job: JobPosting):
-    """Create a new job posting"""
-    job_dict = job.model_dump()
-    job_dict["id"] = str(len(jobs_db) + 1)
-    job_dict["created_at"] = datetime.now()
 
-    jobs_db.append(job_dict)
-    return job_dict
+def _iter_lows(bits: int):
+    """The low halves set in a bitmap container, ascending, decoded as consumed"""
+    for position, byte in enumerate(bits.to_bytes(8192, "little")):
+        while byte:
+            lowest = byte & -byte
+            yield position * 8 + lowest.bit_length() - 1
+            byte ^= lowest
 
-@app.get("/api/jobs/{job_id}", response_model=JobPosting)
-async def get_job(job_id: str):
-    """Get a specific job posting by ID"""
-    job = next((j for j in jobs_db if j["id"] == job_id), None)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    return job
 
-@app.put("/api/jobs/{job_id}", response_model=JobPosting)
-async def update_job(job_id: str, job: JobPosting):
-    """Update a job posting"""
-    idx = next((i for i, j in enumerate(jobs_db) if j["id"] == job_id), None)
-    if idx is None:
-        raise HTTPException(status_code=404, detail="Job not found")
+def _lows_of(bits: int) -> array:
+    return array("H", _iter_lows(bits))
 
-    job_dict = job.model_dump()
-    job_dict["id"] = job_id
 
-    jobs_db[idx] = job_dict
-    return job_dict
+class RoaringBitmap:
+    """Set of non-negative integers split into containers of 65536, roaring-style.
 
-# ==================== Analytics Routes ====================
+    Each container keeps the low 16 bits of its members as a sorted array while
+    it holds at most ARRAY_CONTAINER_MAX of them and as a 65536-bit int beyond
+    that, so a rare value costs 2 bytes per member and a common one 8 KiB per
+    65536 ids. Intersections go container by container; two bitmap
+    containers are ANDed and counted with a single int operation each.
+    """
 
-@app.get("/api/analytics/recruitment")
-async def get_recruitment_analytics():
-    """Get recruitment analytics and metrics"""
-    total_candidates = len(candidates_db)
-    total_interviews = len(interviews_db)
-    total_jobs = len(jobs_db)
+    __slots__ = ("_containers", "_size")
 
-    # Status breakdown
-    status_counts = {}
-    for candidate in candidates_db:
-        status = candidate.get("status", "unknown")
-        status_counts[status] = status_counts.get(status, 0) + 1
+    def __init__(self):
+        self._containers: Dict[int, Any] = {}  # high 16 bits -> array("H") or int
+        self._size = 0
 
-    return {
-        "total_candidates": total_candidates,
-        "total_interviews": total_interviews,
-        "total_jobs": total_jobs,
-        "candidate_status_breakdown": status_counts,
-        "active_jobs": len([j for j in jobs_db if j.get("status") == "published"]),
-        "pending_interviews": len([i for i in interviews_db if i.get("status") == "scheduled"])
-    }
+    def __len__(self) -> int:
+        return self._size
 
-# ==================== Run Server ====================
+    def __contains__(self, value: int) -> bool:
+        container = self._containers.get(value >> 16)
+        if container is None:
+            return False
+        low = value & 0xFFFF
+        if type(container) is int:
+            return bool(container >> low & 1)
+        position = bisect.bisect_left(container, low)
+        return position < len(container) and container[position] == low
 
-if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    def __iter__(self):
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            base = high << 16
+            for low in _iter_lows(container) if type(container) is int else container:
+                yield base | low
+
+    def add(self, value: int):
+        high, low = value >> 16, value & 0xFFFF
+        container = self._containers.get(high)
+        if container is None:
+            self._containers[high] = array("H", (low,))
+        elif type(container) is int:
+            if container >> low & 1:
+                return
+            self._containers[high] = container | 1 << low
+        else:
+            position = bisect.bisect_left(container, low)
+            if position < len(container) and container[position] == low:
+                return
+            container.insert(position, low)
+            if len(container) > ARRAY_CONTAINER_MAX:
+                self._containers[high] = _bitmap_of(container)
+        self._size += 1
+
+    def discard(self, value: int):
+        high, low = value >> 16, value & 0xFFFF
+        container = self._containers.get(high)
+        if container is None:
+            return
+        if type(container) is int:
+            if not container >> low & 1:
+                return
+            container ^= 1 << low
+            # Half the threshold, so a value hovering around it does not flip on every write.
+            if container.bit_count() <= ARRAY_CONTAINER_MAX // 2:
+                container = _lows_of(container)
+            self._containers[high] = container
+        else:
+            position = bisect.bisect_left(container, low)
+            if position == len(container) or container[position] != low:
+                return
+            del container[position]
+        if not container:
+            del self._containers[high]
+        self._size -= 1
+
+    def __and__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        result = RoaringBitmap()
+        if len(other._containers) < len(self._containers):
+            self, other = other, self
+        for high, container in self._containers.items():
+            peer = other._containers.get(high)
+            if peer is None:
+                continue
+            if type(container) is int and type(peer) is int:
+                # Left as a bitmap even when sparse: intersections are query-scoped.
+                both = container & peer
+                count = both.bit_count()
+            else:
+                both = array("H", _intersect(container, peer))
+                count = len(both)
+            if count:
+                result._containers[high] = both
+                result._size += count
+        return result
+
+    def intersection_count(self, other: "RoaringBitmap") -> int:
+        """len(self & other) without building the intersection"""
+        if len(other._containers) < len(self._containers):
+            self, other = other, self
+        total = 0
+        for high, container in self._containers.items():
+            peer = other._containers.get(high)
+            if peer is None:
+                continue
+            if type(container) is int and type(peer) is int:
+                total += (container & peer).bit_count()
+            else:
+                total += sum(1 for _ in _intersect(container, peer))
+        return total
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._containers) + sum(map(sys.getsizeof, self._containers.values()))
+
+
+def _intersect(container, peer):
+    """Low halves in both containers, at least one of which is an array"""
+    if type(container) is int:
+        container, peer = peer, container
+    if type(peer) is int:
+        bits = peer.to_bytes(8192, "little")
+        return (low for low in container if bits[low >> 3] >> (low & 7) & 1)
+    if len(peer) < len(container):
+        container, peer = peer, container
+    members = set(peer)
+    return (low for low in container if low in members)
+
+
+class IntervalIndex:
+    """Records' [low, high] intervals, for overlap queries.
+
+    Finite intervals are grouped by width class (class k holds widths below 2**k
+    and at least half that), each class sorted by low end. An interval overlapping
+    [lo, hi] starts within [lo - 2**k, hi] for its class, so a query bisects each
+    class to that window; a few very wide intervals only widen the window of their
+    own class instead of every query's. Intervals open at one end are kept sorted
+    by their finite end and answered with one bisection. A query costs
+    O(classes * log n + window) rather than a scan of every record.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        self._classes: Dict[int, List[Tuple[Any, str, Any]]] = {}  # width class -> [(low, record id, high)]
+        self._open_high: List[Tuple[Any, str]] = []  # [low, inf): (low, record id)
+        self._open_low: List[Tuple[Any, str]] = []  # (-inf, high]: (high, record id)
+        self._size = 0
+
+    def _slot(self, record_id: str, low, high) -> Tuple[list, tuple]:
+        if high == math.inf:
+            return self._open_high, (low, record_id)
+        if low == -math.inf:
+            return self._open_low, (high, record_id)
+        return self._classes.setdefault(int(high - low).bit_length(), []), (low, record_id, high)
+
+    def add(self, record_id: str, low, high):
+        entries, entry = self._slot(record_id, low, high)
+        bisect.insort(entries, entry)
+        self._size += 1
+
+    def remove(self, record_id: str, low, high):
+        entries, entry = self._slot(record_id, low, high)
+        position = bisect.bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+            self._size -= 1
+
+    def _windows(self, lo, hi):
+        """(entries, first, last) slices holding every interval that may overlap [lo, hi]"""
+        low_end = operator.itemgetter(0)
+        for width_class, entries in self._classes.items():
+            first = bisect.bisect_left(entries, lo - (1 << width_class), key=low_end)
+            yield entries, first, bisect.bisect_right(entries, hi, key=low_end, lo=first)
+        yield self._open_high, 0, bisect.bisect_right(self._open_high, hi, key=low_end)
+        yield self._open_low, bisect.bisect_left(self._open_low, lo, key=low_end), len(self._open_low)
+
+    def estimate(self, lo, hi) -> int:
+        """Intervals to check for an overlap query; an upper bound on the matches"""
+        return sum(last - first for _, first, last in self._windows(lo, hi))
+
+    def overlapping(self, lo, hi) -> List[str]:
+        """Ids of the intervals overlapping [lo, hi], in no particular order"""
+        found = []
+        for entries, first, last in self._windows(lo, hi):
+            if entries is self._open_high or entries is self._open_low:
+                found.extend(record_id for _, record_id in entries[first:last])
+            else:
+                found.extend(record_id for _, record_id, high in entries[first:last] if high >= lo)
+        return found
+
+    def nbytes(self) -> int:
+        open_ended = len(self._open_high) + len(self._open_low)
+        return (sum(sys.getsizeof(entries) for entries in (*self._classes.values(), self._open_high, self._open_low))
+                + (self._size - open_ended) * sys.getsizeof((0, "", 0)) + open_ended * sys.getsizeof((0, "")))
+
+
+class Collection:
+    """In-memory record store keyed by id, preserving insertion order.
+
+    Fields listed in `indexed` get a hash index (value -> RoaringBitmap of ids)
+    that `filter`, `count` and `count_by` use instead of scanning, and from which
+    `facet_counts` answers any combination of equality filters. Fields in `unique`
+    map to a key function; two records may not share a key, checked in O(1) on
+    every write. Listeners registered with `subscribe` receive every write as
+    (event, record, changes), where changes maps each modified field to its
+    (old, new) values. With a `record_type`, incoming dicts are stored as that
+    (compact) mapping type instead. Each entry of `intervals` names a pair of
+    (low, high) fields kept in an IntervalIndex for `filter(overlaps=...)`.
+    """
+
+    def __init__(self, name: str, indexed: Tuple[str, ...] = (),
+                 unique: Optional[Dict[str, Callable[[Any], Any]]] = None,
+                 record_type: Optional[type] = None,
+                 intervals: Optional[Dict[str, Tuple[str, str]]] = None):
+        self.name = name
+        self.record_type = record_type
+        self._records: Dict[str, dict] = {}
+        self._next_id = 1
+        self._indexes: Dict[str, Dict[Any, RoaringBitmap]] = {field: {} for field in indexed}
+        self._unique_keys: Dict[str, Callable[[Any], Any]] = unique or {}
+        self._unique: Dict[str, Dict[Any, str]] = {field: {} for field in self._unique_keys}
+        self._interval_fields: Dict[str, Tuple[str, str]] = intervals or {}
+        self._intervals: Dict[str, IntervalIndex] = {name: IntervalIndex() for name in self._interval_fields}
+        self._versions: Dict[str, int] = {}
+        self._listeners: List[Callable[[str, dict, Changes], None]] = []
+        # Interned categoricals are shared between records, so they are not charged to any one.
+        self._shared_fields = getattr(record_type, "_categorical", frozenset())
+        self._read_owned = None
+        if record_type is not None:
+            owned = [field for field in record_type.__slots__ if field not in self._shared_fields]
+            self._read_owned = operator.attrgetter(*owned) if len(owned) > 1 else None
+        self._owned_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records.values())
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self._records
+
+    def subscribe(self, listener: Callable[[str, dict, Changes], None]):
+        self._listeners.append(listener)
+
+    def _notify(self, event: str, record: dict, changes: Changes):
+        for listener in self._listeners:
+            listener(event, record, changes)
+
+    def _index(self, field: str, value, record_id: str):
+        index = self._indexes[field]
+        bucket = index.get(value)
+        if bucket is None:
+            bucket = index[value] = RoaringBitmap()
+        bucket.add(int(record_id))
+
+    def _unindex(self, field: str, value, record_id: str):
+        bucket = self._indexes[field].get(value)
+        if bucket is not None:
+            bucket.discard(int(record_id))
+            if not bucket:
+                del self._indexes[field][value]
+
+    def unique_owner(self, field: str, value) -> Optional[str]:
+        """Id of the record holding this value of a unique field, if any"""
+        if value is None:
+            return None
+        return self._unique[field].get(self._unique_keys[field](value))
+
+    def _check_unique(self, record: dict, record_id: Optional[str] = None):
+        for field in self._unique:
+            owner = self.unique_owner(field, record.get(field))
+            if owner is not None and owner != record_id:
+                raise DuplicateKeyError(self.name, field, owner)
+
+    def _claim_unique(self, field: str, old, new, record_id: str):
+        keys, key_of = self._unique[field], self._unique_keys[field]
+        if old is not None:
+            key = key_of(old)
+            if keys.pop(key, None) is not None:
+                self._owned_bytes -= sys.getsizeof(key)
+        if new is not None:
+            key = key_of(new)
+            keys[key] = record_id
+            self._owned_bytes += sys.getsizeof(key)
+
+    def _record_bytes(self, record: dict) -> int:
+        if self._read_owned is not None:
+            try:
+                return sys.getsizeof(record) + sum(map(value_bytes, self._read_owned(record)))
+            except AttributeError:
+                pass  # a slot is unset; fall back to the mapping interface
+        return sys.getsizeof(record) + sum(value_bytes(value) for field, value in record.items()
+                                           if field not in self._shared_fields)
+
+    def _coerce(self, record: dict) -> dict:
+        if self.record_type is None or isinstance(record, self.record_type):
+            return record
+        return self.record_type(record)
+
+    def insert(self, record: dict) -> dict:
+        """Store a new record under the next free id"""
+        record = self._coerce(record)
+        self._check_unique(record)
+        record["id"] = str(self._next_id)
+        self._next_id += 1
+        self._records[record["id"]] = record
+        self._versions[record["id"]] = 1
+        self._owned_bytes += self._record_bytes(record)
+        for field in self._indexes:
+            self._index(field, record.get(field), record["id"])
+        for field in self._unique:
+            self._claim_unique(field, None, record.get(field), record["id"])
+        for name in self._intervals:
+            self._index_interval(name, record, record["id"], add=True)
+        self._notify("insert", record, {})
+        return record
+
+    def get(self, record_id: str) -> Optional[dict]:
+        return self._records.get(record_id)
+
+    def version(self, record_id: str) -> Optional[int]:
+        """Counter bumped on every change to the record, starting at 1"""
+        return self._versions.get(record_id)
+
+    def replace(self, record_id: str, record: dict) -> Optional[dict]:
+        """Swap the stored record for a new one, or return None if the id is unknown"""
+        previous = self._records.get(record_id)
+        if previous is None:
+            return None
+        record = self._coerce(record)
+        self._check_unique(record, record_id)
+        record["id"] = record_id
+        changes = diff_records(previous, record)
+        self._records[record_id] = record
+        self._owned_bytes += self._record_bytes(record) - self._record_bytes(previous)
+        if changes:
+            self._versions[record_id] += 1
+        self._reindex(record_id, changes)
+        self._notify("update", record, changes)
+        return record
+
+    def patch(self, record_id: str, fields: dict) -> Optional[Changes]:
+        """Update only the given fields in place and return what actually changed"""
+        record = self._records.get(record_id)
+        if record is None:
+            return None
+        changes = {field: (record.get(field), value) for field, value in fields.items()
+                   if record.get(field) != value}
+        self._check_unique({field: new for field, (_, new) in changes.items()}, record_id)
+        if changes:
+            record.update((field, new) for field, (_, new) in changes.items())
+            self._owned_bytes += sum(value_bytes(new) - value_bytes(old) for field, (old, new) in changes.items()
+                                     if field not in self._shared_fields)
+            self._versions[record_id] += 1
+            self._reindex(record_id, changes)
+            self._notify("update", record, changes)
+        return changes
+
+    def _interval(self, name: str, record) -> Optional[Tuple[Any, Any]]:
+        """A record's (low, high) interval; a missing end is unbounded, and with both missing there is none"""
+        low_field, high_field = self._interval_fields[name]
+        low, high = record.get(low_field), record.get(high_field)
+        if low is None and high is None:
+            return None
+        if low is None or high is None:
+            return (-math.inf if low is None else low, math.inf if high is None else high)
+        return (low, high) if low <= high else (high, low)
+
+    def _index_interval(self, name: str, record, record_id: str, add: bool):
+        interval = self._interval(name, record)
+        if interval is not None:
+            if add:
+                self._intervals[name].add(record_id, *interval)
+            else:
+                self._intervals[name].remove(record_id, *interval)
+
+    def _reindex(self, record_id: str, changes: Changes):
+        for name, fields in self._interval_fields.items():
+            if changes.keys() & set(fields):
+                record = self._records[record_id]
+                previous = {field: changes[field][0] if field in changes else record.get(field) for field in fields}
+                self._index_interval(name, previous, record_id, add=False)
+                self._index_interval(name, record, record_id, add=True)
+        for field, (old, new) in changes.items():
+            if field in self._indexes:
+                self._unindex(field, old, record_id)
+                self._index(field, new, record_id)
+            if field in self._unique:
+                self._claim_unique(field, old, new, record_id)
+
+    def delete(self, record_id: str) -> Optional[dict]:
+        return self._remove(record_id, release_unique=True)
+
+    def evict(self, record_id: str) -> Optional[dict]:
+        """Drop a record moved to another tier; its unique keys stay claimed"""
+        return self._remove(record_id, release_unique=False)
+
+    def _remove(self, record_id: str, release_unique: bool) -> Optional[dict]:
+        record = self._records.pop(record_id, None)
+        if record is not None:
+            del self._versions[record_id]
+            self._owned_bytes -= self._record_bytes(record)
+            for field in self._indexes:
+                self._unindex(field, record.get(field), record_id)
+            if release_unique:
+                for field in self._unique:
+                    self._claim_unique(field, record.get(field), None, record_id)
+            for name in self._intervals:
+                self._index_interval(name, record, record_id, add=False)
+            self._notify("delete", record, {})
+        return record
+
+    def reserve_unique(self, field: str, value, record_id: str):
+        """Claim a unique key for a record held outside the collection"""
+        self._claim_unique(field, None, value, record_id)
+
+    def release_unique(self, field: str, value, record_id: str):
+        """Free a unique key reserved for a record held outside the collection"""
+        if self.unique_owner(field, value) == record_id:
+            self._claim_unique(field, value, None, record_id)
+
+    def advance_ids(self, next_id: int):
+        """Never hand out ids below next_id, e.g. ids already used by archived records"""
+        self._next_id = max(self._next_id, next_id)
+
+    def filter(self, limit: Optional[int] = None, overlaps: Optional[Dict[str, Tuple[Any, Any]]] = None,
+               **criteria) -> List[dict]:
+        """Records whose fields equal every non-None criterion and whose intervals
+        overlap every (lo, hi) in `overlaps`.
+
+        Records come in insertion (id) order. Indexed criteria are answered by
+        intersecting their buckets; when there are none, or an interval window is
+        smaller than their smallest bucket, only that window is walked.
+        """
+        criteria = {field: value for field, value in criteria.items() if value is not None}
+        overlaps = dict(overlaps or {})
+        sources = [(len(self._indexes[f].get(criteria[f], ())), "indexed", f) for f in criteria if f in self._indexes]
+        sources += [(self._intervals[name].estimate(*bounds), "interval", name) for name, bounds in overlaps.items()]
+        if sources:
+            _, kind, name = min(sources)
+            if kind == "indexed":
+                buckets = sorted((self._indexes[f].get(criteria.pop(f), RoaringBitmap())
+                                  for f in list(criteria) if f in self._indexes), key=len)
+                selected = buckets[0]
+                for other in buckets[1:]:
+                    selected = selected & other
+                bucket = map(str, selected)
+            else:
+                # Matches come in interval order; ordering the ids restores insertion order, and
+                # when nothing else filters them only the first `limit` need ordering.
+                ids = self._intervals[name].overlapping(*overlaps.pop(name))
+                if limit is not None and not criteria and not overlaps:
+                    bucket = heapq.nsmallest(limit, ids, key=int)
+                else:
+                    bucket = sorted(ids, key=int)
+            matches = (self._records[record_id] for record_id in bucket)
+        else:
+            matches = iter(self._records.values())
+        if criteria:
+            matches = (r for r in matches if all(r.get(f) == v for f, v in criteria.items()))
+        for name, (lo, hi) in overlaps.items():
+            matches = (r for r in matches if self._overlaps(name, r, lo, hi))
+        return list(islice(matches, limit))
+
+    def _overlaps(self, name: str, record, lo, hi) -> bool:
+        interval = self._interval(name, record)
+        return interval is not None and interval[0] <= hi and interval[1] >= lo
+
+    def count(self, **criteria) -> int:
+        criteria = {field: value for field, value in criteria.items() if value is not None}
+        if len(criteria) == 1:
+            (field, value), = criteria.items()
+            if field in self._indexes:
+                return len(self._indexes[field].get(value, ()))
+        return len(self.filter(**criteria))
+
+    def count_by(self, field: str) -> Dict[str, int]:
+        """Number of records per distinct value of a field"""
+        if field in self._indexes:
+            return {value: len(ids) for value, ids in self._indexes[field].items()}
+        counts: Dict[str, int] = {}
+        for record in self._records.values():
+            value = record.get(field, "unknown")
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    def facet_counts(self, fields: Tuple[str, ...], overlaps: Optional[Dict[str, Tuple[Any, Any]]] = None,
+                     **criteria) -> Tuple[int, Dict[str, Dict[Any, int]]]:
+        """Records matching every non-None criterion (and `overlaps`, as in filter),
+        and per value of each field how many of them have it.
+
+        A field's own criterion is left out of its counts, so a facet already
+        filtered on still shows what choosing another of its values would give.
+        Every field and criterion must be indexed; the counts are intersections of
+        the per-value bitmaps, never a walk over the records.
+        """
+        criteria = {field: value for field, value in criteria.items() if value is not None}
+        unknown = [field for field in (*fields, *criteria) if field not in self._indexes]
+        if unknown:
+            raise ValueError(f"{self.name}: not indexed: {', '.join(unknown)}")
+        in_ranges = []
+        for name, bounds in (overlaps or {}).items():
+            in_range = RoaringBitmap()
+            for record_id in self._intervals[name].overlapping(*bounds):
+                in_range.add(int(record_id))
+            in_ranges.append(in_range)
+        selections: Dict[Optional[str], Optional[RoaringBitmap]] = {}
+
+        def selection(excluded: Optional[str]) -> Optional[RoaringBitmap]:
+            """Ids matching the criteria other than `excluded`'s; None when unfiltered"""
+            if excluded not in selections:
+                bitmaps = [self._indexes[field].get(value, RoaringBitmap())
+                           for field, value in criteria.items() if field != excluded] + in_ranges
+                bitmaps.sort(key=len)
+                selected = bitmaps[0] if bitmaps else None
+                for bitmap in bitmaps[1:]:
+                    selected = selected & bitmap
+                selections[excluded] = selected
+            return selections[excluded]
+
+        facets = {}
+        for field in fields:
+            selected = selection(field if field in criteria else None)
+            counts = {value: len(bitmap) if selected is None else selected.intersection_count(bitmap)
+                      for value, bitmap in self._indexes[field].items() if value is not None}
+            facets[field] = dict(sorted(counts.items(), key=lambda item: -item[1]))
+        matched = selection(None)
+        return (len(self._records) if matched is None else len(matched)), facets
+
+    def memory_usage(self) -> dict:
+        """Approximate bytes held: records and unique keys are tallied on every write,
+        index and table overhead is summed here (proportional to distinct values, not records)"""
+        index_bytes = sys.getsizeof(self._records) + sys.getsizeof(self._versions)
+        for index in self._indexes.values():
+            index_bytes += sys.getsizeof(index) + sum(bucket.nbytes() for bucket in index.values())
+        index_bytes += sum(map(sys.getsizeof, self._unique.values()))
+        index_bytes += sum(index.nbytes() for index in self._intervals.values())
+        return {"records": len(self._records), "record_bytes": self._owned_bytes, "index_bytes": index_bytes}
+
+    def clear(self):
+        self._records.clear()
+        self._versions.clear()
+        self._next_id = 1
+        self._owned_bytes = 0
+        for index in self._indexes.values():
+            index.clear()
+        for keys in self._unique.values():
+            keys.clear()
+        for index in self._intervals.values():
+            index.clear()
+
+
+# Providers whose mailboxes ignore "+tag" suffixes, and those that also ignore dots.
+PLUS_ADDRESSING_DOMAINS = frozenset({
+    "gmail.com", "outlook.com", "hotmail.com", "live.com", "msn.com", "icloud.com", "me.com",
+    "fastmail.com", "proton.me", "protonmail.com",
+})
+DOTLESS_DOMAINS = frozenset({"gmail.com"})
+DOMAIN_ALIASES = {"googlemail.com": "gmail.com"}
+
+
+def normalize_email(email: str) -> str:
+    """Canonical mailbox for duplicate detection: case-folded, provider tag and dot rules applied"""
+    local, _, domain = email.strip().casefold().rpartition("@")
+    domain = DOMAIN_ALIASES.get(domain, domain)
+    if domain in PLUS_ADDRESSING_DOMAINS:
+        local = local.split("+", 1)[0]
+    if domain in DOTLESS_DOMAINS:
+        local = local.replace(".", "")
+    return f"{local}@{domain}"
+
+
+CandidateRecord = compact_record_type(Candidate, categorical=("status", "position", "source"))
+InterviewRecord = compact_record_type(Interview, categorical=("type", "status"))
+JobPostingRecord = compact_record_type(JobPosting, categorical=("department", "location", "type", "status"))
+
+# Browsing facets: indexed fields whose per-value counts sit next to the list filters.
+CANDIDATE_FACETS = ("status", "position", "source")
+JOB_FACETS = ("status", "department", "location", "type")
+
+
+class StoreGate:
+    """Keeps writes out of batch snapshots.
+
+    Writes share the gate with each other and read-only batches share it with
+    each other; a batch containing writes holds it alone. Waiters are admitted
+    in arrival order across kinds: once a write is queued, later batches wait
+    behind it, and once a batch is queued, later writes do. Neither steady writes
+    nor overlapping read batches can starve the other kind.
+    """
+
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._writers = 0
+        self._readers = 0
+        self._exclusive = False
+        self._waiting: Dict[int, str] = {}  # arrival ticket -> "write", "read" or "exclusive"
+        self._tickets = itertools.count()
+
+    def _admissible(self, ticket: int, kind: str) -> bool:
+        if self._exclusive or (kind != "read" and self._readers) or (kind != "write" and self._writers):
+            return False
+        # Only same-kind shared waiters may be passed; anyone else queued earlier goes first.
+        return not any(earlier < ticket and (other != kind or kind == "exclusive")
+                       for earlier, other in self._waiting.items())
+
+    @asynccontextmanager
+    async def _hold(self, kind: str):
+        async with self._cond:
+            ticket = next(self._tickets)
+            self._waiting[ticket] = kind
+            try:
+                await self._cond.wait_for(lambda: self._admissible(ticket, kind))
+            finally:
+                del self._waiting[ticket]
+                self._cond.notify_all()
+            if kind == "write":
+                self._writers += 1
+            elif kind == "read":
+                self._readers += 1
+            else:
+                self._exclusive = True
+        try:
+            yield
+        finally:
+            async with self._cond:
+                if kind == "write":
+                    self._writers -= 1
+                elif kind == "read":
+                    self._readers -= 1
+                else:
+                    self._exclusive = False
+                self._cond.notify_all()
+
+    def write(self):
+        return self._hold("write")
+
+    def snapshot(self, exclusive: bool = False):
+        return self._hold("exclusive" if exclusive else "read")
+
+
+# ==================== Status History ====================
+
+NO_STAGE = ""  # stage code 0: where a candidate's first transition comes from
+MAX_STAGES = 1 << 16
+DEFAULT_FUNNEL = ("new", "screening", "interview", "offer", "hired")
+
+
+def epoch_seconds(moment: Optional[datetime]) -> float:
+    return moment.timestamp() if moment is not None else time.time()
+
+
+class StatusTransitionLog:
+    """Append-only candidate status history held in typed arrays.
+
+    One transition costs 20 bytes: when it happened, the candidate, the stages
+    left and entered (dictionary-encoded) and how long the candidate had spent in
+    the stage it left. Funnel and dwell-time queries scan the arrays with numpy
+    when it is installed, and in pure Python otherwise.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.stages: List[str] = [NO_STAGE]
+        self._codes: Dict[str, int] = {NO_STAGE: 0}
+        self.at = array("d")
+        self.candidate = array("I")
+        self.from_stage = array("H")
+        self.to_stage = array("H")
+        self.dwell = array("f")
+        # Indexed by candidate id: when the candidate entered its current stage.
+        self._entered_at = array("d")
+
+    def __len__(self) -> int:
+        return len(self.at)
+
+    def nbytes(self) -> int:
+        columns = (self.at, self.candidate, self.from_stage, self.to_stage, self.dwell, self._entered_at)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def code(self, stage: Optional[str]) -> int:
+        stage = stage or NO_STAGE
+        code = self._codes.get(stage)
+        if code is None:
+            if len(self.stages) >= MAX_STAGES:
+                raise ValueError(f"More than {MAX_STAGES} distinct stages")
+            code = self._codes[stage] = len(self.stages)
+            self.stages.append(stage)
+        return code
+
+    def append(self, candidate_id: int, old: Optional[str], new: Optional[str], at: float):
+        entered = self._entered_at
+        if candidate_id >= len(entered):
+            entered.extend(itertools.repeat(math.nan, candidate_id + 1 - len(entered)))
+        self.at.append(at)
+        self.candidate.append(candidate_id)
+        self.from_stage.append(self.code(old))
+        self.to_stage.append(self.code(new))
+        # NaN when the stage was entered before the log started (or for a first transition).
+        self.dwell.append(max(at - entered[candidate_id], 0.0) if old else math.nan)
+        entered[candidate_id] = at
+
+    def on_candidate_event(self, event: str, record: dict, changes: Changes):
+        """Collection listener: log creations and status changes"""
+        if event == "insert":
+            self.append(int(record["id"]), None, record.get("status"), epoch_seconds(record.get("created_at")))
+        elif event == "update" and "status" in changes:
+            old, new = changes["status"]
+            self.append(int(record["id"]), old, new, epoch_seconds(record.get("updated_at")))
+
+    def _window(self, since: Optional[float], until: Optional[float]):
+        return lambda t: (since is None or t >= since) and (until is None or t < until)
+
+    def funnel(self, stages: List[str], since: Optional[float] = None, until: Optional[float] = None) -> List[int]:
+        """Distinct candidates that entered each stage within the time window"""
+        codes = [self._codes.get(stage) for stage in stages]
+        np = optional_import("numpy") if len(self) else None
+        if np is not None:
+            at = np.frombuffer(self.at, dtype=np.float64)
+            to_stage = np.frombuffer(self.to_stage, dtype=np.uint16)
+            candidate = np.frombuffer(self.candidate, dtype=np.uint32)
+            in_window = np.ones(len(at), dtype=bool)
+            if since is not None:
+                in_window &= at >= since
+            if until is not None:
+                in_window &= at < until
+            reached = np.zeros(len(self._entered_at), dtype=bool)
+            counts = []
+            for code in codes:
+                if code is None:
+                    counts.append(0)
+                    continue
+                reached[:] = False
+                reached[candidate[in_window & (to_stage == code)]] = True
+                counts.append(int(np.count_nonzero(reached)))
+            return counts
+        wanted = {code: set() for code in codes if code is not None}
+        in_window = self._window(since, until)
+        for t, c, code in zip(self.at, self.candidate, self.to_stage):
+            if code in wanted and in_window(t):
+                wanted[code].add(c)
+        return [len(wanted[code]) if code is not None else 0 for code in codes]
+
+    def dwell_times(self, since: Optional[float] = None, until: Optional[float] = None) -> Dict[str, dict]:
+        """Seconds spent in each stage before leaving it: count, mean, median and p90"""
+        stats: Dict[str, dict] = {}
+        np = optional_import("numpy") if len(self) else None
+        if np is not None:
+            at = np.frombuffer(self.at, dtype=np.float64)
+            dwell = np.frombuffer(self.dwell, dtype=np.float32)
+            from_stage = np.frombuffer(self.from_stage, dtype=np.uint16)
+            keep = ~np.isnan(dwell)
+            if since is not None:
+                keep &= at >= since
+            if until is not None:
+                keep &= at < until
+            dwell, from_stage = dwell[keep].astype(np.float64), from_stage[keep]
+            order = np.argsort(from_stage, kind="stable")
+            codes, starts = np.unique(from_stage[order], return_index=True)
+            for code, group in zip(codes, np.split(dwell[order], starts[1:])):
+                median, p90 = np.percentile(group, [50, 90])
+                stats[self.stages[code]] = {"transitions": int(group.size), "mean": float(group.mean()),
+                                            "median": float(median), "p90": float(p90)}
+            return stats
+        groups: Dict[int, List[float]] = {}
+        in_window = self._window(since, until)
+        for t, d, code in zip(self.at, self.dwell, self.from_stage):
+            if d == d and in_window(t):
+                groups.setdefault(code, []).append(d)
+        for code, group in groups.items():
+            group.sort()
+            stats[self.stages[code]] = {"transitions": len(group), "mean": sum(group) / len(group),
+                                        "median": percentile(group, 50), "p90": percentile(group, 90)}
+        return stats
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Linear-interpolated percentile of a sorted list (numpy's default method)"""
+    position = (len(ordered) - 1) * q / 100
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+# ==================== Candidate Search ====================
+
+SEARCH_TOKEN = re.compile(r"[^\W_]+(?:\+\+|#)?")  # words, keeping "c++" and "c#" whole
+SEARCH_FIELDS = ("name", "position", "notes", "cv_text")
+
+
+def tokenize(text: Optional[str]) -> Counter:
+    return Counter(token for token in SEARCH_TOKEN.findall(text.casefold()) if len(token) > 1) if text else Counter()
+
+
+class SearchIndex:
+    """Inverted index over candidate text: token -> {candidate id: occurrences}.
+
+    Kept current by a collection listener; an update re-tokenizes only the text
+    fields it changed.
+    """
+
+    def __init__(self, fields: Tuple[str, ...] = SEARCH_FIELDS):
+        self.fields = fields
+        self._postings: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def clear(self):
+        self._postings.clear()
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._postings) + sum(
+            sys.getsizeof(token) + sys.getsizeof(posting) for token, posting in self._postings.items()
+        )
+
+    def _apply(self, record_id: str, delta: Counter):
+        for token, count in delta.items():
+            posting = self._postings.setdefault(token, {})
+            count += posting.get(record_id, 0)
+            if count > 0:
+                posting[record_id] = count
+            else:
+                posting.pop(record_id, None)
+                if not posting:
+                    del self._postings[token]
+
+    def on_candidate_event(self, event: str, record: dict, changes: Changes):
+        """Collection listener: index new text, unindex old text"""
+        if event in ("insert", "delete"):
+            delta = tokenize(" ".join(filter(None, map(record.get, self.fields))))
+            if event == "delete":
+                delta = Counter({token: -count for token, count in delta.items()})
+        else:
+            delta = Counter()
+            for field in self.fields:
+                if field in changes:
+                    old, new = changes[field]
+                    delta.update(tokenize(new))
+                    delta.subtract(tokenize(old))
+        if delta:
+            self._apply(record["id"], delta)
+
+    def search(self, query: str, limit: int) -> List[Tuple[str, int]]:
+        """Ids of records containing every query term, most occurrences first"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        postings = sorted((self._postings.get(term, {}) for term in terms), key=len)
+        scores = dict(postings[0])
+        for posting in postings[1:]:
+            scores = {record_id: score + posting[record_id] for record_id, score in scores.items()
+                      if record_id in posting}
+            if not scores:
+                break
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+# ==================== Scheduling ====================
+
+SCHEDULER_MAX_SLEEP = 60.0  # re-check the clock at least this often, in case it jumps
+
+
+class DeadlineScheduler:
+    """Timers kept on a min-heap of deadlines and fired by a single asyncio task.
+
+    An action may be a plain call or return a coroutine, which then runs as its
+    own task. The task sleeps until the earliest deadline (or until an earlier timer is
+    added) instead of polling the stores. Rescheduling or cancelling a timer only
+    marks its heap entry dead; dead entries are dropped when they surface, or all
+    at once when they outnumber the live timers.
+    """
+
+    def __init__(self):
+        self._heap: List[list] = []  # [deadline, sequence, key, action or None when dead]
+        self._timers: Dict[Any, list] = {}
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending_actions: set = set()
+        self.fired = 0
+        self.failed = 0
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def schedule(self, key, deadline: float, action: Callable[[], Any]):
+        """Run action at deadline (epoch seconds), replacing any timer under the same key"""
+        self.cancel(key)
+        entry = [deadline, next(self._sequence), key, action]
+        self._timers[key] = entry
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry and self._wakeup is not None:
+            self._wakeup.set()
+
+    def cancel(self, key):
+        entry = self._timers.pop(key, None)
+        if entry is not None:
+            entry[3] = None
+            if len(self._heap) > 2 * len(self._timers) + 64:
+                self._heap = [e for e in self._heap if e[3] is not None]
+                heapq.heapify(self._heap)
+
+    def cancel_where(self, predicate: Callable[[Any], bool]):
+        for key in [key for key in self._timers if predicate(key)]:
+            self.cancel(key)
+
+    def deadline(self, key) -> Optional[float]:
+        entry = self._timers.get(key)
+        return entry[0] if entry is not None else None
+
+    def next_deadline(self) -> Optional[float]:
+        heap = self._heap
+        while heap and heap[0][3] is None:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now: float) -> List[Callable[[], Any]]:
+        """Remove and return the actions of every timer due by now, earliest first"""
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, key, action = heapq.heappop(heap)
+            if action is not None:
+                del self._timers[key]
+                due.append(action)
+        return due
+
+    async def start(self):
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        tasks = [task for task in (self._task, *self._pending_actions) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def _action_done(self, task: asyncio.Task):
+        self._pending_actions.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.failed += 1
+            logger.error("Scheduled action failed", exc_info=task.exception())
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            for action in self.pop_due(time.time()):
+                try:
+                    result = action()
+                    self.fired += 1
+                except Exception:
+                    self.failed += 1
+                    logger.exception("Scheduled action failed")
+                    continue
+                if asyncio.iscoroutine(result):
+                    # Actions that wait (e.g. for a store gate) must not hold up the other timers.
+                    task = asyncio.create_task(result)
+                    self._pending_actions.add(task)
+                    task.add_done_callback(self._action_done)
+            upcoming = self.next_deadline()
+            timeout = SCHEDULER_MAX_SLEEP if upcoming is None else min(max(upcoming - time.time(), 0.0),
+                                                                       SCHEDULER_MAX_SLEEP)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def metrics(self) -> dict:
+        upcoming = self.next_deadline()
+        return {
+            "running": self._task is not None,
+            "timers": len(self._timers),
+            "heap_entries": len(self._heap),
+            "running_actions": len(self._pending_actions),
+            "next_deadline": datetime.fromtimestamp(upcoming).isoformat() if upcoming is not None else None,
+            "fired": self.fired,
+            "failed": self.failed,
+        }
+
+
+class Outbox:
+    """Outgoing events appended to a JSON Lines file in batches.
+
+    Events are buffered in memory and written with one append per batch, at most
+    every flush_interval seconds or as soon as batch_size events are waiting, so
+    file I/O stays off the path that publishes them.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.totals: Counter = Counter()
+        self._pending: List[dict] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def publish(self, event: dict):
+        self._pending.append(event)
+        self.totals["published"] += 1
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        lines = "".join(json.dumps(event, default=str) + "\n" for event in batch)
+        try:
+            await run_in_threadpool(self._append, lines)
+        except OSError:
+            self._pending[:0] = batch  # keep the batch for the next attempt
+            self.totals["write_errors"] += 1
+            raise
+        self.totals["written"] += len(batch)
+        self.totals["batches"] += 1
+
+    def _append(self, lines: str):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    async def start(self):
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except OSError:
+                logger.exception("Could not write to outbox %s", self.path)
+
+    def metrics(self) -> dict:
+        return {
+            "path": self.path,
+            "pending": len(self._pending),
+            "published": self.totals["published"],
+            "written": self.totals["written"],
+            "batches": self.totals["batches"],
+            "write_errors": self.totals["write_errors"],
+        }
+
+
+# Minutes before an interview at which a reminder fires.
+INTERVIEW_REMINDER_MINUTES = tuple(sorted(
+    int(minutes) for minutes in os.getenv("INTERVIEW_REMINDER_MINUTES", "1440,60").split(",") if minutes.strip()
+))
+
+
+class InterviewReminders:
+    """Reminder timers for one tenant's upcoming interviews.
+
+    Every scheduled interview gets one timer per lead time. Lead times already
+    past when the interview is (re)scheduled collapse into one reminder fired
+    right away. Reminders carry a deterministic id, so a consumer of the outbox
+    can drop the duplicates a restart may produce.
+    """
+
+    def __init__(self, org_id: str, interviews: Collection, scheduler: DeadlineScheduler, outbox: Outbox,
+                 lead_minutes: Tuple[int, ...] = INTERVIEW_REMINDER_MINUTES):
+        self.org_id = org_id
+        self.interviews = interviews
+        self.scheduler = scheduler
+        self.outbox = outbox
+        self.lead_minutes = lead_minutes
+
+    def _key(self, interview_id: str, lead: int) -> tuple:
+        return ("interview-reminder", self.org_id, interview_id, lead)
+
+    def cancel(self, interview_id: str):
+        for lead in self.lead_minutes:
+            self.scheduler.cancel(self._key(interview_id, lead))
+
+    def plan(self, record: dict):
+        """(Re)schedule the reminders of one interview from its current state"""
+        interview_id = record["id"]
+        self.cancel(interview_id)
+        if record.get("status") != "scheduled" or record.get("scheduled_at") is None:
+            return
+        starts = epoch_seconds(record["scheduled_at"])
+        now = time.time()
+        if starts <= now:
+            return
+        missed = [lead for lead in self.lead_minutes if starts - lead * 60 <= now]
+        for lead in self.lead_minutes:
+            if lead in missed and lead != missed[0]:
+                continue
+            deadline = now if lead in missed else starts - lead * 60
+            self.scheduler.schedule(self._key(interview_id, lead), deadline,
+                                    lambda interview_id=interview_id, lead=lead: self.fire(interview_id, lead))
+
+    def fire(self, interview_id: str, lead: int):
+        record = self.interviews.get(interview_id)
+        if record is None or record.get("status") != "scheduled":
+            return
+        scheduled_at = record["scheduled_at"]
+        self.outbox.publish({
+            "id": f"{self.org_id}:{interview_id}:{lead}:{int(epoch_seconds(scheduled_at))}",
+            "type": "interview.reminder",
+            "organization_id": self.org_id,
+            "interview_id": interview_id,
+            "candidate_id": record.get("candidate_id"),
+            "scheduled_at": scheduled_at.isoformat(),
+            "lead_minutes": lead,
+            "interviewers": list(record.get("interviewers") or ()),
+            "created_at": datetime.now().isoformat(),
+        })
+
+    def on_interview_event(self, event: str, record: dict, changes: Changes):
+        """Collection listener: keep the timers in step with scheduling changes"""
+        if event == "delete":
+            self.cancel(record["id"])
+        elif event == "insert" or "scheduled_at" in changes or "status" in changes:
+            self.plan(record)
+
+    def rebuild(self):
+        for record in self.interviews:
+            self.plan(record)
+
+    def clear(self):
+        self.scheduler.cancel_where(lambda key: key[:2] == ("interview-reminder", self.org_id))
+
+
+class JobPublicationSchedule:
+    """Timed status changes of one tenant's job postings.
+
+    A posting in status "scheduled" is published when its published_at passes,
+    and a scheduled or published posting with an expires_at is closed when that
+    passes. The change goes through the collection like any other write, so the
+    status index (and the active-jobs count read from it) follows. An expiry at
+    or before the publication time closes the posting without publishing it.
+    """
+
+    def __init__(self, org_id: str, jobs: Collection, gate: StoreGate, scheduler: DeadlineScheduler):
+        self.org_id = org_id
+        self.jobs = jobs
+        self.gate = gate
+        self.scheduler = scheduler
+        self.transitions: Counter = Counter()
+
+    def _key(self, kind: str, job_id: str) -> tuple:
+        return ("job-" + kind, self.org_id, job_id)
+
+    def cancel(self, job_id: str):
+        self.scheduler.cancel(self._key("publish", job_id))
+        self.scheduler.cancel(self._key("expire", job_id))
+
+    def plan(self, record: dict):
+        """(Re)schedule the status changes of one posting from its current state"""
+        job_id = record["id"]
+        self.cancel(job_id)
+        status = record.get("status")
+        expires_at = record.get("expires_at")
+        if status == "scheduled" and record.get("published_at") is not None \
+                and (expires_at is None or epoch_seconds(expires_at) > epoch_seconds(record["published_at"])):
+            self.scheduler.schedule(self._key("publish", job_id), epoch_seconds(record["published_at"]),
+                                    lambda: self.transition(job_id, "published_at", ("scheduled",), "published"))
+        if status in ("scheduled", "published") and expires_at is not None:
+            self.scheduler.schedule(self._key("expire", job_id), epoch_seconds(record["expires_at"]),
+                                    lambda: self.transition(job_id, "expires_at", ("scheduled", "published"), "closed"))
+
+    async def transition(self, job_id: str, deadline_field: str, from_statuses: Tuple[str, ...], to_status: str):
+        async with self.gate.write():
+            record = self.jobs.get(job_id)
+            # The posting may have changed while this waited for the gate.
+            if (record is None or record.get("status") not in from_statuses
+                    or record.get(deadline_field) is None or epoch_seconds(record[deadline_field]) > time.time()):
+                return
+            self.jobs.patch(job_id, {"status": to_status})
+            self.transitions[to_status] += 1
+
+    def on_job_event(self, event: str, record: dict, changes: Changes):
+        """Collection listener: keep the timers in step with status and date changes"""
+        if event == "delete":
+            self.cancel(record["id"])
+        elif event == "insert" or changes.keys() & {"status", "published_at", "expires_at"}:
+            self.plan(record)
+
+    def rebuild(self):
+        for record in self.jobs:
+            self.plan(record)
+
+    def clear(self):
+        self.scheduler.cancel_where(lambda key: key[0] in ("job-publish", "job-expire") and key[1] == self.org_id)
+
+
+scheduler = DeadlineScheduler()
+reminder_outbox = Outbox(
+    os.getenv("REMINDER_OUTBOX_PATH", os.path.join(tempfile.gettempdir(), "targetym-outbox", "reminders.jsonl")),
+    batch_size=int(os.getenv("REMINDER_OUTBOX_BATCH", "500")),
+)
+startup_hooks.append(reminder_outbox.start)
+startup_hooks.append(scheduler.start)
+shutdown_hooks.append(reminder_outbox.stop)
+shutdown_hooks.append(scheduler.stop)
+
+# ==================== Cold Storage ====================
+
+CANDIDATE_ARCHIVE_DIR = os.getenv("CANDIDATE_ARCHIVE_DIR", os.path.join(tempfile.gettempdir(), "targetym-archive"))
+ARCHIVE_STATUSES = ("rejected", "hired")
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_SWEEP_HOURS = float(os.getenv("ARCHIVE_SWEEP_HOURS", "24"))  # 0 turns the periodic sweep off
+ARCHIVE_BLOCK_RECORDS = 256
+ARCHIVE_CACHED_BLOCKS = 32
+SEGMENT_TRAILER = struct.Struct(">Q4s")  # footer length, magic
+SEGMENT_MAGIC = b"TYA1"
+
+
+def json_default(value):
+    """json.dumps fallback matching the API's encoding of dates"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class ArchiveSegment:
+    """One immutable archive file.
+
+    Records are sorted by id and written as JSON lines in zlib-compressed blocks
+    of ARCHIVE_BLOCK_RECORDS. A footer lists each block's offset, length and id
+    range, so finding a record is a bisect over block first ids and one block
+    read. The index costs about 24 bytes per block, not per record.
+
+    Blocks are read through a descriptor opened with the segment, so a segment
+    object keeps reading the file it was opened on even after a rewrite replaces
+    that path; the descriptor closes once the object is dropped.
+    """
+
+    def __init__(self, path: str, blocks: List[list], unique_fields: Tuple[str, ...] = ()):
+        self.path = path
+        self.unique_fields = tuple(unique_fields)
+        self._fd = os.open(path, os.O_RDONLY)
+        self._close = weakref.finalize(self, os.close, self._fd)
+        self.offsets = array("Q", (block[0] for block in blocks))
+        self.lengths = array("I", (block[1] for block in blocks))
+        self.first_ids = array("Q", (block[2] for block in blocks))
+        self.last_ids = array("Q", (block[3] for block in blocks))
+        self.counts = array("I", (block[4] for block in blocks))
+
+    def __len__(self) -> int:
+        return sum(self.counts)
+
+    @classmethod
+    def write(cls, path: str, records: List[dict], unique_fields: Tuple[str, ...]) -> "ArchiveSegment":
+        records = sorted(records, key=lambda record: int(record["id"]))
+        blocks = []
+        partial = path + ".part"
+        with open(partial, "wb") as f:
+            offset = 0
+            for start in range(0, len(records), ARCHIVE_BLOCK_RECORDS):
+                chunk = records[start:start + ARCHIVE_BLOCK_RECORDS]
+                lines = "".join(f"{record['id']}\t{json.dumps(record, default=json_default)}\n" for record in chunk)
+                data = zlib.compress(lines.encode(), 6)
+                f.write(data)
+                blocks.append([offset, len(data), int(chunk[0]["id"]), int(chunk[-1]["id"]), len(chunk)])
+                offset += len(data)
+            footer = zlib.compress(json.dumps({
+                "blocks": blocks,
+                "unique": {field: [[record["id"], record.get(field)] for record in records] for field in unique_fields},
+            }).encode())
+            f.write(footer)
+            f.write(SEGMENT_TRAILER.pack(len(footer), SEGMENT_MAGIC))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(partial, path)
+        return cls(path, blocks, unique_fields)
+
+    @classmethod
+    def open(cls, path: str) -> Tuple["ArchiveSegment", Dict[str, List[list]]]:
+        """Read a segment's index, and the unique field values of its records"""
+        with open(path, "rb") as f:
+            f.seek(-SEGMENT_TRAILER.size, os.SEEK_END)
+            footer_length, magic = SEGMENT_TRAILER.unpack(f.read(SEGMENT_TRAILER.size))
+            if magic != SEGMENT_MAGIC:
+                raise ValueError(f"{path} is not an archive segment")
+            f.seek(-SEGMENT_TRAILER.size - footer_length, os.SEEK_END)
+            footer = json.loads(zlib.decompress(f.read(footer_length)))
+        return cls(path, footer["blocks"], tuple(footer["unique"])), footer["unique"]
+
+    def find_block(self, record_id: int) -> Optional[int]:
+        block = bisect.bisect_right(self.first_ids, record_id) - 1
+        return block if block >= 0 and record_id <= self.last_ids[block] else None
+
+    def read_block(self, block: int) -> bytes:
+        return zlib.decompress(os.pread(self._fd, self.lengths[block], self.offsets[block]))
+
+    def records(self) -> List[dict]:
+        return [json.loads(line.split(b"\t", 1)[1])
+                for block in range(len(self.offsets)) for line in self.read_block(block).splitlines()]
+
+    def close(self):
+        self._close()
+
+    def nbytes(self) -> int:
+        columns = (self.offsets, self.lengths, self.first_ids, self.last_ids, self.counts)
+        return sum(column.itemsize * len(column) for column in columns)
+
+
+class CandidateArchive:
+    """Cold tier of one tenant's candidates: append-only segment files on local disk.
+
+    Only block indexes are held in memory. Lookups check segments newest first
+    and keep recently read blocks decoded in a small LRU. Reads do blocking file
+    I/O, so routes call them through the threadpool. Erasing a record rewrites
+    the one segment holding it.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.segments: List[ArchiveSegment] = []
+        self.max_id = 0
+        self._blocks: "OrderedDict[Tuple[ArchiveSegment, int], Dict[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # one append or rewrite at a time
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self.segments)
+
+    def _segment_paths(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                      if name.endswith(".seg"))
+
+    def load(self) -> Dict[str, List[list]]:
+        """Open the segments already on disk; returns the (id, value) pairs of unique fields"""
+        self.segments, unique = [], {}
+        for path in self._segment_paths():
+            segment, values = ArchiveSegment.open(path)
+            self.segments.append(segment)
+            self.max_id = max(self.max_id, segment.last_ids[-1] if len(segment.last_ids) else 0)
+            for field, pairs in values.items():
+                unique.setdefault(field, []).extend(pairs)
+        return unique
+
+    def append(self, records: List[dict], unique_fields: Tuple[str, ...] = ()) -> ArchiveSegment:
+        """Write records to a new segment"""
+        with self._write_lock:
+            os.makedirs(self.directory, exist_ok=True)
+            paths = self._segment_paths()
+            number = int(os.path.basename(paths[-1])[:-4]) + 1 if paths else 1
+            segment = ArchiveSegment.write(os.path.join(self.directory, f"{number:06d}.seg"), records, unique_fields)
+            self.segments.append(segment)
+            self.max_id = max(self.max_id, segment.last_ids[-1])
+            return segment
+
+    def delete(self, record_id: str) -> Optional[dict]:
+        """Erase a record, returning it, by rewriting its segment without it.
+
+        Costs one segment rewrite (up to a sweep's worth of records), which is fine
+        for erasure requests. Reads already under way finish on the old file.
+        """
+        with self._write_lock:
+            found = self._locate(record_id)
+            if found is None:
+                return None
+            segment = found[0]
+            position = self.segments.index(segment)
+            records = segment.records()
+            erased = next(record for record in records if record["id"] == record_id)
+            remaining = [record for record in records if record["id"] != record_id]
+            if remaining:
+                self.segments[position] = ArchiveSegment.write(segment.path, remaining, segment.unique_fields)
+            else:
+                del self.segments[position]
+                os.unlink(segment.path)
+            with self._lock:
+                for key in [key for key in self._blocks if key[0] is segment]:
+                    del self._blocks[key]
+            return erased
+
+    def _block_lines(self, segment: ArchiveSegment, block: int) -> Dict[str, bytes]:
+        key = (segment, block)
+        with self._lock:
+            lines = self._blocks.get(key)
+            if lines is not None:
+                self._blocks.move_to_end(key)
+                return lines
+        lines = dict(line.split(b"\t", 1) for line in segment.read_block(block).splitlines())
+        lines = {record_id.decode(): line for record_id, line in lines.items()}
+        with self._lock:
+            self._blocks[key] = lines
+            while len(self._blocks) > ARCHIVE_CACHED_BLOCKS:
+                self._blocks.popitem(last=False)
+        return lines
+
+    def _locate(self, record_id: str) -> Optional[Tuple[ArchiveSegment, bytes]]:
+        """The segment holding a record, and the record's line"""
+        try:
+            number = int(record_id)
+        except ValueError:
+            return None
+        # A snapshot of the list: a concurrent erase may swap a segment out meanwhile.
+        for segment in reversed(list(self.segments)):
+            block = segment.find_block(number)
+            if block is not None:
+                line = self._block_lines(segment, block).get(record_id)
+                if line is not None:
+                    return segment, line
+        return None
+
+    def get(self, record_id: str) -> Optional[dict]:
+        found = self._locate(record_id)
+        return json.loads(found[1]) if found is not None else None
+
+    def blocks(self) -> List[Tuple[ArchiveSegment, int]]:
+        return [(segment, block) for segment in self.segments for block in range(len(segment.offsets))]
+
+    def export_block(self, segment: ArchiveSegment, block: int) -> bytes:
+        """One block's records as NDJSON, read without going through the cache"""
+        return b"".join(line.split(b"\t", 1)[1] + b"\n" for line in segment.read_block(block).splitlines())
+
+    def clear(self):
+        """Forget the archive and delete its files"""
+        for segment in self.segments:
+            segment.close()
+        for path in self._segment_paths():
+            os.unlink(path)
+        self.segments = []
+        self.max_id = 0
+        with self._lock:
+            self._blocks.clear()
+
+    def usage(self) -> dict:
+        return {
+            "records": len(self),
+            "segments": len(self.segments),
+            "blocks": sum(len(segment.offsets) for segment in self.segments),
+            "disk_bytes": sum(os.path.getsize(segment.path) for segment in self.segments),
+            "index_bytes": sum(segment.nbytes() for segment in self.segments),
+        }
+
+# ==================== Tenants ====================
+
+TENANT_HEADER = "X-Organization-Id"
+DEFAULT_TENANT = "default"
+ORGANIZATION_ID = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,63}")
+READ_METHODS = frozenset({"GET", "HEAD"})
+# Organizations the API serves, comma-separated; unset accepts any well-formed id. Either
+# way at most MAX_TENANTS are opened, since a tenant's store lives until the process exits.
+ALLOWED_ORGANIZATIONS = frozenset(org.strip() for org in os.getenv("ALLOWED_ORGANIZATIONS", "").split(",") if org.strip())
+MAX_TENANTS = int(os.getenv("MAX_TENANTS", "1000"))
+
+
+class TenantLimitReached(Exception):
+    """Opening another tenant would exceed the registry's bound"""
+
+
+class TenantStore:
+    """One organization's partition: its own collections, indexes, id counters and write gate.
+
+    Queries only ever touch the tenant's own records, so their cost does not grow
+    with the number of organizations hosted by the process.
+    """
+
+    def __init__(self, org_id: str):
+        self.org_id = org_id
+        self.candidates = Collection("candidates", indexed=CANDIDATE_FACETS,
+                                     unique={"email": normalize_email}, record_type=CandidateRecord)
+        self.interviews = Collection("interviews", indexed=("candidate_id", "status"), record_type=InterviewRecord)
+        self.jobs = Collection("jobs", indexed=JOB_FACETS, record_type=JobPostingRecord,
+                               intervals={"salary": ("salary_min", "salary_max")})
+        self.reminders = InterviewReminders(org_id, self.interviews, scheduler, reminder_outbox)
+        self.interviews.subscribe(self.reminders.on_interview_event)
+        self.gate = StoreGate()
+        self.publication = JobPublicationSchedule(org_id, self.jobs, self.gate, scheduler)
+        self.jobs.subscribe(self.publication.on_job_event)
+        self.status_log = StatusTransitionLog()
+        self.candidates.subscribe(self.status_log.on_candidate_event)
+        self.search = SearchIndex()
+        self.candidates.subscribe(self.search.on_candidate_event)
+        # Uploaded CV file per candidate id: content hash, size, kind and path on disk.
+        self.cv_files: Dict[str, dict] = {}
+        # References to each stored file by content hash (store_cv_file takes one, in a worker
+        # thread); a CV is personal data, so its file is unlinked with its last reference.
+        self.cv_refs: Counter = Counter()
+        self.cv_lock = threading.Lock()
+        self.archive = CandidateArchive(os.path.join(CANDIDATE_ARCHIVE_DIR, org_id))
+
+    def collections(self) -> Dict[str, Collection]:
+        return {"candidates": self.candidates, "interviews": self.interviews, "jobs": self.jobs}
+
+    def clear(self):
+        for collection in self.collections().values():
+            collection.clear()
+        self.reminders.clear()
+        self.publication.clear()
+        self.status_log.clear()
+        self.search.clear()
+        for candidate_id in list(self.cv_files):
+            self.detach_cv(candidate_id)
+        self.archive.clear()
+
+    def attach_cv(self, candidate_id: str, stored: dict):
+        """Record a candidate's CV, whose reference store_cv_file took, releasing the one it replaces"""
+        previous = self.cv_files.get(candidate_id)
+        self.cv_files[candidate_id] = stored
+        if previous is not None:
+            self.release_cv(previous)
+
+    def detach_cv(self, candidate_id: str):
+        previous = self.cv_files.pop(candidate_id, None)
+        if previous is not None:
+            self.release_cv(previous)
+
+    def release_cv(self, stored: dict):
+        with self.cv_lock:
+            self.cv_refs[stored["sha256"]] -= 1
+            if self.cv_refs[stored["sha256"]] > 0:
+                return
+            del self.cv_refs[stored["sha256"]]
+            try:
+                os.unlink(stored["path"])
+            except FileNotFoundError:
+                pass
+
+    def memory_usage(self) -> dict:
+        collections = {name: collection.memory_usage() for name, collection in self.collections().items()}
+        status_log_bytes = self.status_log.nbytes()
+        search_bytes = self.search.nbytes()
+        archive = self.archive.usage()
+        return {
+            "organization_id": self.org_id,
+            "total_bytes": status_log_bytes + search_bytes + archive["index_bytes"]
+                           + sum(u["record_bytes"] + u["index_bytes"] for u in collections.values()),
+            "collections": collections,
+            "status_log": {"transitions": len(self.status_log), "bytes": status_log_bytes},
+            "search_index": {"tokens": len(self.search), "bytes": search_bytes},
+            "archive": archive,
+        }
+
+
+class TenantRegistry:
+    """Tenant stores by organization id, created on their first write.
+
+    Tenants hold the only copy of their records, so they are never evicted; instead
+    the registry refuses organizations outside the allow-list (when there is one) and
+    new tenants past max_tenants.
+    """
+
+    def __init__(self, allowed: frozenset = frozenset(), max_tenants: int = 1000):
+        self.allowed = allowed
+        self.max_tenants = max_tenants
+        self._tenants: Dict[str, TenantStore] = {}
+        self.default = self.open(DEFAULT_TENANT, restoring=True)
+
+    def __iter__(self):
+        return iter(list(self._tenants.values()))
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def admits(self, org_id: str) -> bool:
+        return org_id == DEFAULT_TENANT or not self.allowed or org_id in self.allowed
+
+    def open(self, org_id: str, restoring: bool = False) -> TenantStore:
+        """The tenant's store, created if needed; restoring skips the bound for data already on disk"""
+        tenant = self._tenants.get(org_id)
+        if tenant is None:
+            if not restoring and len(self._tenants) >= self.max_tenants:
+                raise TenantLimitReached(org_id)
+            tenant = self._tenants[org_id] = TenantStore(org_id)
+        return tenant
+
+    def peek(self, org_id: str) -> TenantStore:
+        """The tenant's store, or an empty unregistered one so reads never allocate a tenant"""
+        return self._tenants.get(org_id) or TenantStore(org_id)
+
+
+tenants = TenantRegistry(ALLOWED_ORGANIZATIONS, MAX_TENANTS)
+# Collections of the default tenant, which serves requests without an organization header.
+candidates_db = tenants.default.candidates
+interviews_db = tenants.default.interviews
+jobs_db = tenants.default.jobs
+
+
+async def rebuild_schedules():
+    """Re-create every tenant's timers from the stored records"""
+    for tenant in tenants:
+        tenant.reminders.rebuild()
+        tenant.publication.rebuild()
+
+
+startup_hooks.append(rebuild_schedules)
+
+
+async def archive_candidates(tenant: TenantStore, older_than_days: float = ARCHIVE_AFTER_DAYS,
+                             in_batch: bool = False) -> dict:
+    """Move rejected and hired candidates untouched for older_than_days into the tenant's archive.
+
+    Holds the tenant's gate alone, or runs under the exclusive hold of the batch it is part of.
+    """
+    cutoff = time.time() - older_than_days * 86400
+    async with nullcontext() if in_batch else tenant.gate.snapshot(exclusive=True):
+        chosen = [record for status in ARCHIVE_STATUSES for record in tenant.candidates.filter(status=status)
+                  if epoch_seconds(record.get("updated_at") or record.get("created_at")) < cutoff]
+        if not chosen:
+            return {"organization_id": tenant.org_id, "archived": 0}
+        # Serializing and compressing happens off the event loop. No write can run meanwhile,
+        # so the records evicted below are exactly the ones written to the segment.
+        segment = await run_in_threadpool(tenant.archive.append, [record_dict(record) for record in chosen], ("email",))
+        for record in chosen:
+            tenant.candidates.evict(record["id"])
+    return {"organization_id": tenant.org_id, "archived": len(chosen), "segment": os.path.basename(segment.path),
+            "segment_bytes": os.path.getsize(segment.path)}
+
+
+async def load_archives():
+    """Reattach archives left on disk by earlier runs, keeping their ids and emails taken"""
+    if not os.path.isdir(CANDIDATE_ARCHIVE_DIR):
+        return
+    for org_id in sorted(os.listdir(CANDIDATE_ARCHIVE_DIR)):
+        if not ORGANIZATION_ID.fullmatch(org_id):
+            continue
+        tenant = tenants.open(org_id, restoring=True)
+        unique = await run_in_threadpool(tenant.archive.load)
+        for field, pairs in unique.items():
+            for record_id, value in pairs:
+                tenant.candidates.reserve_unique(field, value, record_id)
+        tenant.candidates.advance_ids(tenant.archive.max_id + 1)
+
+
+async def sweep_archives():
+    """Archive every tenant's stale candidates, then schedule the next sweep"""
+    try:
+        for tenant in tenants:
+            await archive_candidates(tenant)
+    finally:
+        scheduler.schedule(("archive-sweep",), time.time() + ARCHIVE_SWEEP_HOURS * 3600, sweep_archives)
+
+
+async def schedule_archive_sweep():
+    if ARCHIVE_SWEEP_HOURS > 0:
+        scheduler.schedule(("archive-sweep",), time.time() + ARCHIVE_SWEEP_HOURS * 3600, sweep_archives)
+
+
+startup_hooks.append(load_archives)
+startup_hooks.append(schedule_archive_sweep)
+
+
+async def get_tenant(request: Request, x_organization_id: Optional[str] = Header(default=None)) -> TenantStore:
+    """Store partition of the organization named in the X-Organization-Id header"""
+    org_id = x_organization_id or DEFAULT_TENANT
+    if not ORGANIZATION_ID.fullmatch(org_id):
+        raise HTTPException(status_code=400, detail=f"Invalid {TENANT_HEADER} header")
+    if not tenants.admits(org_id):
+        raise HTTPException(status_code=403, detail=f"Unknown organization: {org_id}")
+    if request.method in READ_METHODS:
+        return tenants.peek(org_id)
+    try:
+        return tenants.open(org_id)
+    except TenantLimitReached:
+        raise HTTPException(status_code=503, detail="No more organizations can be hosted by this server")
+
+
+async def store_write_access(request: Request, tenant: TenantStore = Depends(get_tenant)):
+    """Hold the tenant's store gate for the duration of a write route"""
+    if getattr(request.state, "in_batch", False):
+        yield
+        return
+    async with tenant.gate.write():
+        yield
+
+
+STORE_WRITE = [Depends(store_write_access)]
+
+# ==================== Field Projection ====================
+
+@lru_cache(maxsize=512)
+def parse_fields(model: type, fields: str) -> Tuple[str, ...]:
+    """Validate a comma-separated `fields=` spec against a model"""
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in model.model_fields]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown) or repr(fields)}. "
+                   f"Available: {', '.join(model.model_fields)}"
+        )
+    return requested
+
+
+@lru_cache(maxsize=256)
+def projection_encoders(model: type, fields: Tuple[str, ...]) -> Tuple[TypeAdapter, TypeAdapter]:
+    """Serializers for one projection; keys outside the projection are dropped on dump"""
+    projection = TypedDict(
+        f"{model.__name__}Projection",
+        {name: model.model_fields[name].annotation for name in fields}
+    )
+    return TypeAdapter(projection), TypeAdapter(List[projection])
+
+
+def project(model: type, fields: str, payload):
+    """Serialize a stored record (or list of records) with only the requested fields"""
+    one, many = projection_encoders(model, parse_fields(model, fields))
+    # The encoders serialize plain dicts only, so compact records are unpacked first.
+    if isinstance(payload, list):
+        encoder, payload = many, [r if isinstance(r, dict) else dict(r) for r in payload]
+    else:
+        encoder, payload = one, payload if isinstance(payload, dict) else dict(payload)
+    return Response(content=encoder.dump_json(payload), media_type="application/json")
+
+@app.exception_handler(DuplicateKeyError)
+async def duplicate_key_handler(request: Request, exc: DuplicateKeyError):
+    return JSONResponse(
+        status_code=409,
+        content={"detail": f"A record with this {exc.field} already exists", "existing_id": exc.existing_id}
+    )
+
+# ==================== Record Versions (ETag / If-Match) ====================
+
+REQUIRE_IF_MATCH = os.getenv("REQUIRE_IF_MATCH", "0") == "1"
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def set_etag(response: Response, collection: Collection, record_id: str):
+    response.headers["ETag"] = etag(collection.version(record_id))
+
+
+def check_if_match(collection: Collection, record_id: str, if_match: Optional[str]):
+    """Reject a write whose If-Match does not name the record's current version"""
+    current = collection.version(record_id)
+    if if_match is None:
+        if REQUIRE_IF_MATCH:
+            raise HTTPException(status_code=428, detail="If-Match header is required")
+        return
+    tags = {tag.strip() for tag in if_match.split(",")}
+    if "*" not in tags and etag(current) not in tags:
+        raise HTTPException(
+            status_code=412,
+            detail="The record was modified since it was read",
+            headers={"ETag": etag(current)}
+        )
+
+# ==================== Partial Updates (JSON Merge Patch) ====================
+
+PATCH_READ_ONLY = frozenset({"id", "created_at", "updated_at"})
+
+
+@lru_cache(maxsize=None)
+def field_adapters(model: type) -> Dict[str, TypeAdapter]:
+    """One validator per model field, so a patch validates only the fields it touches"""
+    return {name: TypeAdapter(info.annotation) for name, info in model.model_fields.items()}
+
+
+def apply_merge_patch(collection: Collection, model: type, record_id: str, patch: dict, label: str,
+                      if_match: Optional[str] = None) -> dict:
+    """Apply an RFC 7386 merge patch to a stored record; null resets a field to None"""
+    record = collection.get(record_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"{label} not found")
+    check_if_match(collection, record_id, if_match)
+
+    adapters = field_adapters(model)
+    changed = {}
+    errors = []
+    for field, value in patch.items():
+        if field not in adapters or field in PATCH_READ_ONLY:
+            errors.append({"type": "extra_forbidden", "loc": ("body", field),
+                           "msg": "Field cannot be patched", "input": value})
+            continue
+        if record.get(field) == value:
+            continue
+        try:
+            value = adapters[field].validate_python(value)
+        except ValidationError as exc:
+            errors.extend({**error, "loc": ("body", field, *error["loc"])}
+                          for error in exc.errors(include_url=False))
+            continue
+        if record.get(field) != value:
+            changed[field] = value
+    if errors:
+        raise RequestValidationError(errors)
+
+    if changed and "updated_at" in adapters:
+        changed["updated_at"] = datetime.now()
+    collection.patch(record_id, changed)
+    return record
+
+# ==================== Routes ====================
+
+@app.get("/")
+async def root():
+    """API Health Check"""
+    return {
+        "status": "online",
+        "message": "TargetYM API is running",
+        "version": "1.0.0",
+        "docs": "/docs"
+    }
+
+@app.get("/api/health")
+async def health_check():
+    """Health check endpoint"""
+    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+
+# ==================== Candidates Routes ====================
+
+@app.get("/api/candidates", response_model=List[Candidate])
+async def get_candidates(
+    status: Optional[str] = None,
+    position: Optional[str] = None,
+    limit: int = 100,
+    fields: Optional[str] = None,
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Get all candidates with optional filtering"""
+    candidates = tenant.candidates.filter(limit=limit, status=status or None, position=position or None)
+    if fields:
+        return project(Candidate, fields, candidates)
+    return candidates
+
+@app.get("/api/candidates/facets")
+async def get_candidate_facets(
+    status: Optional[str] = None,
+    position: Optional[str] = None,
+    source: Optional[str] = None,
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Candidate counts per status, position and source under the given filters"""
+    total, facets = tenant.candidates.facet_counts(CANDIDATE_FACETS, status=status or None,
+                                                   position=position or None, source=source or None)
+    return {"total": total, "facets": facets}
+
+@app.post("/api/candidates", response_model=Candidate, status_code=201, dependencies=STORE_WRITE)
+async def create_candidate(candidate: Candidate, response: Response, tenant: TenantStore = Depends(get_tenant)):
+    """Create a new candidate"""
+    candidate_dict = candidate.model_dump()
+    candidate_dict["created_at"] = datetime.now()
+    candidate_dict["updated_at"] = datetime.now()
+
+    candidate_dict = tenant.candidates.insert(candidate_dict)
+    set_etag(response, tenant.candidates, candidate_dict["id"])
+    return candidate_dict
+
+@app.post("/api/candidates/bulk", dependencies=STORE_WRITE)
+async def bulk_import_candidates(
+    candidates: List[Candidate] = Body(..., max_length=5000),
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Import many candidates at once, skipping duplicate emails"""
+    results = []
+    seen: Dict[str, int] = {}
+    now = datetime.now()
+    for position, candidate in enumerate(candidates):
+        key = normalize_email(candidate.email)
+        existing_id = tenant.candidates.unique_owner("email", candidate.email)
+        if existing_id is not None:
+            results.append({"index": position, "error": "duplicate_email", "existing_id": existing_id})
+        elif key in seen:
+            results.append({"index": position, "error": "duplicate_email", "duplicate_of_index": seen[key]})
+        else:
+            seen[key] = position
+            candidate_dict = candidate.model_dump()
+            candidate_dict["created_at"] = now
+            candidate_dict["updated_at"] = now
+            results.append({"index": position, "id": tenant.candidates.insert(candidate_dict)["id"]})
+    created = sum(1 for result in results if "id" in result)
+    return {"created": created, "skipped": len(results) - created, "results": results}
+
+@app.get("/api/candidates/duplicates")
+async def find_duplicate_candidates(tenant: TenantStore = Depends(get_tenant)):
+    """Group existing candidates sharing a normalized email, in one hashing pass"""
+    groups: Dict[str, List[str]] = {}
+    for candidate in tenant.candidates:
+        groups.setdefault(normalize_email(candidate["email"]), []).append(candidate["id"])
+    duplicates = [{"email": email, "candidate_ids": ids} for email, ids in groups.items() if len(ids) > 1]
+    return {"groups": duplicates, "total_groups": len(duplicates)}
+
+@app.get("/api/candidates/search", response_model=List[Candidate])
+async def search_candidates(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    fields: Optional[str] = None,
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Full-text search over candidate name, position, notes and CV text"""
+    candidates = [tenant.candidates.get(record_id) for record_id, _ in tenant.search.search(q, limit)]
+    if fields:
+        return project(Candidate, fields, candidates)
+    return candidates
+
+@app.get("/api/candidates/export")
+async def export_candidates(include_archived: bool = True, tenant: TenantStore = Depends(get_tenant)):
+    """Stream every candidate as NDJSON, archived ones included"""
+    hot = list(tenant.candidates)
+    blocks = tenant.archive.blocks() if include_archived else []
+    encode = projection_encoders(Candidate, tuple(Candidate.model_fields))[0].dump_json
+
+    async def lines():
+        for start in range(0, len(hot), 1000):
+            yield b"".join(encode(record_dict(record)) + b"\n" for record in hot[start:start + 1000])
+        for segment, block in blocks:
+            yield await run_in_threadpool(tenant.archive.export_block, segment, block)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson",
+                             headers={"Content-Disposition": 'attachment; filename="candidates.ndjson"'})
+
+async def find_archived(tenant: TenantStore, candidate_id: str) -> dict:
+    """A candidate from the tenant's archive, or 404"""
+    candidate = await run_in_threadpool(tenant.archive.get, candidate_id) if tenant.archive.segments else None
+    if candidate is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return candidate
+
+async def erase_archived(tenant: TenantStore, candidate_id: str, if_match: Optional[str]) -> dict:
+    """Delete a candidate from the tenant's archive and free their email, or 404"""
+    if not tenant.archive.segments or await run_in_threadpool(tenant.archive.get, candidate_id) is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    # Archived records carry no version, so only "If-Match: *" can name one.
+    if if_match is None and REQUIRE_IF_MATCH:
+        raise HTTPException(status_code=428, detail="If-Match header is required")
+    if if_match is not None and "*" not in {tag.strip() for tag in if_match.split(",")}:
+        raise HTTPException(status_code=412, detail="The record was modified since it was read")
+    erased = await run_in_threadpool(tenant.archive.delete, candidate_id)
+    if erased is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    tenant.candidates.release_unique("email", erased.get("email"), candidate_id)
+    return erased
+
+async def reject_archived_write(tenant: TenantStore, candidate_id: str):
+    """Writes to an archived candidate get 409 instead of a misleading 404"""
+    if candidate_id not in tenant.candidates and tenant.archive.segments:
+        if await run_in_threadpool(tenant.archive.get, candidate_id) is not None:
+            raise HTTPException(status_code=409, detail="Candidate is archived and read-only")
+
+@app.get("/api/candidates/{candidate_id}", response_model=Candidate)
+async def get_candidate(
+    candidate_id: str,
+    response: Response,
+    fields: Optional[str] = None,
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Get a specific candidate by ID"""
+    candidate = tenant.candidates.get(candidate_id)
+    if not candidate:
+        candidate = await find_archived(tenant, candidate_id)
+        # Archived records are read-only, so they carry no version to build an ETag from.
+        return project(Candidate, fields, candidate) if fields else candidate
+    if fields:
+        response = project(Candidate, fields, candidate)
+        set_etag(response, tenant.candidates, candidate_id)
+        return response
+    set_etag(response, tenant.candidates, candidate_id)
+    return candidate
+
+@app.put("/api/candidates/{candidate_id}", response_model=Candidate, dependencies=STORE_WRITE)
+async def update_candidate(
+    candidate_id: str,
+    candidate: Candidate,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Update a candidate"""
+    existing = tenant.candidates.get(candidate_id)
+    if existing is None:
+        await reject_archived_write(tenant, candidate_id)
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    check_if_match(tenant.candidates, candidate_id, if_match)
+
+    candidate_dict = candidate.model_dump()
+    candidate_dict["created_at"] = existing["created_at"]
+    candidate_dict["updated_at"] = datetime.now()
+    if candidate_dict["cv_text"] is None:
+        candidate_dict["cv_text"] = existing.get("cv_text")
+
+    candidate_dict = tenant.candidates.replace(candidate_id, candidate_dict)
+    set_etag(response, tenant.candidates, candidate_id)
+    return candidate_dict
+
+@app.patch("/api/candidates/{candidate_id}", response_model=Candidate, dependencies=STORE_WRITE)
+async def patch_candidate(
+    candidate_id: str,
+    response: Response,
+    patch: Dict[str, Any] = Body(...),
+    if_match: Optional[str] = Header(default=None),
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Partially update a candidate with a JSON merge patch"""
+    await reject_archived_write(tenant, candidate_id)
+    candidate = apply_merge_patch(tenant.candidates, Candidate, candidate_id, patch, "Candidate", if_match)
+    set_etag(response, tenant.candidates, candidate_id)
+    return candidate
+
+@app.delete("/api/candidates/{candidate_id}", dependencies=STORE_WRITE)
+async def delete_candidate(
+    candidate_id: str,
+    if_match: Optional[str] = Header(default=None),
+    interviews: str = Query(default="delete", pattern="^(delete|cancel)$"),
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Delete a candidate, archived or not, and delete or cancel their interviews"""
+    if candidate_id in tenant.candidates:
+        check_if_match(tenant.candidates, candidate_id, if_match)
+        tenant.candidates.delete(candidate_id)
+    else:
+        await erase_archived(tenant, candidate_id, if_match)
+    tenant.detach_cv(candidate_id)
+
+    # The candidate_id index on interviews is the reverse index: O(k) in the candidate's interviews.
+    linked = tenant.interviews.filter(candidate_id=candidate_id)
+    for interview in linked:
+        if interviews == "cancel":
+            tenant.interviews.patch(interview["id"], {"status": "cancelled"})
+        else:
+            tenant.interviews.delete(interview["id"])
+
+    return {
+        "message": "Candidate deleted successfully",
+        "interviews_deleted" if interviews == "delete" else "interviews_cancelled": len(linked),
+    }
+
+@app.get("/api/candidates/{candidate_id}/full", response_model=CandidateWithInterviews)
+async def get_candidate_full(candidate_id: str, tenant: TenantStore = Depends(get_tenant)):
+    """Get a candidate together with all their interviews"""
+    candidate = tenant.candidates.get(candidate_id) or await find_archived(tenant, candidate_id)
+    return {"candidate": candidate, "interviews": tenant.interviews.filter(candidate_id=candidate_id)}
+
+# ==================== Interviews Routes ====================
+
+@app.get("/api/interviews", response_model=List[Interview])
+async def get_interviews(
+    candidate_id: Optional[str] = None,
+    status: Optional[str] = None,
+    fields: Optional[str] = None,
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Get all interviews with optional filtering"""
+    interviews = tenant.interviews.filter(candidate_id=candidate_id or None, status=status or None)
+    if fields:
+        return project(Interview, fields, interviews)
+    return interviews
+
+@app.post("/api/interviews", response_model=Interview, status_code=201, dependencies=STORE_WRITE)
+async def create_interview(interview: Interview, response: Response, tenant: TenantStore = Depends(get_tenant)):
+    """Schedule a new interview"""
+    interview_dict = interview.model_dump()
+    interview_dict["created_at"] = datetime.now()
+
+    interview_dict = tenant.interviews.insert(interview_dict)
+    set_etag(response, tenant.interviews, interview_dict["id"])
+    return interview_dict
+
+@app.put("/api/interviews/{interview_id}", response_model=Interview, dependencies=STORE_WRITE)
+async def update_interview(
+    interview_id: str,
+    interview: Interview,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Update an interview"""
+    existing = tenant.interviews.get(interview_id)
+    if existing is None:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    check_if_match(tenant.interviews, interview_id, if_match)
+
+    interview_dict = interview.model_dump()
+    interview_dict["created_at"] = existing["created_at"]
+
+    interview_dict = tenant.interviews.replace(interview_id, interview_dict)
+    set_etag(response, tenant.interviews, interview_id)
+    return interview_dict
+
+@app.patch("/api/interviews/{interview_id}", response_model=Interview, dependencies=STORE_WRITE)
+async def patch_interview(
+    interview_id: str,
+    response: Response,
+    patch: Dict[str, Any] = Body(...),
+    if_match: Optional[str] = Header(default=None),
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Partially update an interview with a JSON merge patch"""
+    interview = apply_merge_patch(tenant.interviews, Interview, interview_id, patch, "Interview", if_match)
+    set_etag(response, tenant.interviews, interview_id)
+    return interview
+
+# ==================== Job Postings Routes ====================
+
+def salary_overlap(salary_min: Optional[int], salary_max: Optional[int]) -> Optional[Dict[str, Tuple[Any, Any]]]:
+    """The `overlaps` filter for a salary query.
+
+    An open end matches any salary, on the query and on the posting alike: a posting
+    "from 100k" (no salary_max) matches salary_min=120000, and one "up to 60k" matches
+    any query reaching down to 60k. Postings with neither end never match.
+    """
+    if salary_min is None and salary_max is None:
+        return None
+    if salary_min is not None and salary_max is not None and salary_min > salary_max:
+        raise HTTPException(status_code=400, detail="salary_min must not exceed salary_max")
+    return {"salary": (salary_min if salary_min is not None else -math.inf,
+                       salary_max if salary_max is not None else math.inf)}
+
+@app.get("/api/jobs", response_model=List[JobPosting])
+async def get_jobs(
+    status: Optional[str] = None,
+    department: Optional[str] = None,
+    salary_min: Optional[int] = Query(default=None, ge=0),
+    salary_max: Optional[int] = Query(default=None, ge=0),
+    fields: Optional[str] = None,
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Get all job postings with optional filtering; salary_min/salary_max keep jobs whose range overlaps them"""
+    jobs = tenant.jobs.filter(overlaps=salary_overlap(salary_min, salary_max), status=status or None, department=department or None)
+    if fields:
+        return project(JobPosting, fields, jobs)
+    return jobs
+
+@app.get("/api/jobs/facets")
+async def get_job_facets(
+    status: Optional[str] = None,
+    department: Optional[str] = None,
+    location: Optional[str] = None,
+    type: Optional[str] = None,
+    salary_min: Optional[int] = Query(default=None, ge=0),
+    salary_max: Optional[int] = Query(default=None, ge=0),
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Job counts per status, department, location and type under the given filters"""
+    total, facets = tenant.jobs.facet_counts(JOB_FACETS, overlaps=salary_overlap(salary_min, salary_max),
+                                             status=status or None, department=department or None,
+                                             location=location or None, type=type or None)
+    return {"total": total, "facets": facets}
+
+@app.post("/api/jobs", response_model=JobPosting, status_code=201, dependencies=STORE_WRITE)
+async def create_job(job: JobPosting, response: Response, tenant: TenantStore = Depends(get_tenant)):
+    """Create a new job posting"""
+    job_dict = job.model_dump()
+    job_dict["created_at"] = datetime.now()
+
+    job_dict = tenant.jobs.insert(job_dict)
+    set_etag(response, tenant.jobs, job_dict["id"])
+    return job_dict
+
+@app.get("/api/jobs/{job_id}", response_model=JobPosting)
+async def get_job(
+    job_id: str,
+    response: Response,
+    fields: Optional[str] = None,
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Get a specific job posting by ID"""
+    job = tenant.jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if fields:
+        response = project(JobPosting, fields, job)
+        set_etag(response, tenant.jobs, job_id)
+        return response
+    set_etag(response, tenant.jobs, job_id)
+    return job
+
+@app.put("/api/jobs/{job_id}", response_model=JobPosting, dependencies=STORE_WRITE)
+async def update_job(
+    job_id: str,
+    job: JobPosting,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Update a job posting"""
+    existing = tenant.jobs.get(job_id)
+    if existing is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    check_if_match(tenant.jobs, job_id, if_match)
+
+    job_dict = job.model_dump()
+    job_dict["created_at"] = existing["created_at"]
+
+    job_dict = tenant.jobs.replace(job_id, job_dict)
+    set_etag(response, tenant.jobs, job_id)
+    return job_dict
+
+@app.patch("/api/jobs/{job_id}", response_model=JobPosting, dependencies=STORE_WRITE)
+async def patch_job(
+    job_id: str,
+    response: Response,
+    patch: Dict[str, Any] = Body(...),
+    if_match: Optional[str] = Header(default=None),
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Partially update a job posting with a JSON merge patch"""
+    job = apply_merge_patch(tenant.jobs, JobPosting, job_id, patch, "Job", if_match)
+    set_etag(response, tenant.jobs, job_id)
+    return job
+
+# ==================== Analytics Routes ====================
+
+@app.get("/api/analytics/recruitment")
+async def get_recruitment_analytics(tenant: TenantStore = Depends(get_tenant)):
+    """Get recruitment analytics and metrics"""
+    total_candidates = len(tenant.candidates)
+    total_interviews = len(tenant.interviews)
+    total_jobs = len(tenant.jobs)
+
+    return {
+        "total_candidates": total_candidates,
+        "total_interviews": total_interviews,
+        "total_jobs": total_jobs,
+        "candidate_status_breakdown": tenant.candidates.count_by("status"),
+        "active_jobs": tenant.jobs.count(status="published"),
+        "pending_interviews": tenant.interviews.count(status="scheduled")
+    }
+
+@app.get("/api/analytics/funnel")
+async def get_recruitment_funnel(
+    stages: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Candidates reaching each pipeline stage, with step and overall conversion rates"""
+    names = [stage.strip() for stage in stages.split(",") if stage.strip()] if stages else list(DEFAULT_FUNNEL)
+    counts = tenant.status_log.funnel(names, epoch_seconds(since) if since else None,
+                                      epoch_seconds(until) if until else None)
+    funnel = []
+    for position, (stage, count) in enumerate(zip(names, counts)):
+        previous = counts[position - 1] if position else count
+        funnel.append({
+            "stage": stage,
+            "candidates": count,
+            "conversion_from_previous": round(count / previous, 4) if previous else None,
+            "conversion_from_start": round(count / counts[0], 4) if counts[0] else None,
+        })
+    return {"stages": funnel, "transitions": len(tenant.status_log)}
+
+@app.get("/api/analytics/stage-durations")
+async def get_stage_durations(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """How long candidates stay in each stage before moving on, in hours"""
+    stats = tenant.status_log.dwell_times(epoch_seconds(since) if since else None,
+                                          epoch_seconds(until) if until else None)
+    return {
+        "stages": [
+            {"stage": stage, "transitions": s["transitions"], "mean_hours": round(s["mean"] / 3600, 2),
+             "median_hours": round(s["median"] / 3600, 2), "p90_hours": round(s["p90"] / 3600, 2)}
+            for stage, s in stats.items()
+        ]
+    }
+
+# ==================== CV Upload & Parsing ====================
+
+CV_STORAGE_DIR = os.getenv("CV_STORAGE_DIR") or os.path.join(tempfile.gettempdir(), "targetym-cvs")
+CV_MAX_BYTES = int(os.getenv("CV_MAX_BYTES", str(10 * 1024 * 1024)))
+CV_MULTIPART_OVERHEAD = 64 * 1024  # boundaries and part headers around the file
+CV_MAX_TEXT_CHARS = 20_000
+CV_CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "text": "text/plain; charset=utf-8",
+}
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class UnsupportedCV(ValueError):
+    pass
+
+
+class CVTooLarge(UnsupportedCV):
+    pass
+
+
+def detect_cv_kind(head: bytes) -> str:
+    """File kind from its first bytes: pdf, docx (a zip) or UTF-8 text"""
+    if head.startswith(b"%PDF-"):
+        if not module_available("pypdf"):
+            raise UnsupportedCV("PDF parsing is not available on this server (pypdf is not installed)")
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        return "docx"
+    if b"\0" not in head:
+        return "text"
+    raise UnsupportedCV("Only PDF, DOCX and plain-text CVs are supported")
+
+
+def store_cv_file(source, tenant: TenantStore) -> dict:
+    """Copy an upload into content-addressed storage, hashing and size-checking as it streams.
+
+    Takes a reference to the stored file for the caller, to hand to attach_cv or release_cv.
+    """
+    directory = os.path.join(CV_STORAGE_DIR, tenant.org_id)
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    kind = None
+    fd, partial = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as target:
+            while chunk := source.read(256 * 1024):
+                if kind is None:
+                    kind = detect_cv_kind(chunk[:4096])
+                size += len(chunk)
+                if size > CV_MAX_BYTES:
+                    raise CVTooLarge(f"CVs are limited to {CV_MAX_BYTES} bytes")
+                digest.update(chunk)
+                target.write(chunk)
+        if kind is None:
+            raise UnsupportedCV("The uploaded file is empty")
+        path = os.path.join(directory, digest.hexdigest())
+        with tenant.cv_lock:
+            # Under the lock, so a release of the same content cannot unlink the file in between.
+            os.replace(partial, path)
+            tenant.cv_refs[digest.hexdigest()] += 1
+    except BaseException:
+        os.unlink(partial)
+        raise
+    return {"sha256": digest.hexdigest(), "size": size, "kind": kind, "path": path}
+
+
+def extract_cv_text(path: str, kind: str, max_chars: int = CV_MAX_TEXT_CHARS) -> str:
+    """Plain text of a stored CV; runs in a worker process"""
+    parts: List[str] = []
+    length = 0
+    if kind == "pdf":
+        for page in optional_import("pypdf").PdfReader(path).pages:
+            parts.append(page.extract_text() or "")
+            length += len(parts[-1])
+            if length >= max_chars:
+                break
+    elif kind == "docx":
+        with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as document:
+            runs: List[str] = []
+            for _, element in ElementTree.iterparse(document):
+                if element.tag == WORD_NAMESPACE + "t":
+                    runs.append(element.text or "")
+                elif element.tag == WORD_NAMESPACE + "tab":
+                    runs.append("\t")
+                elif element.tag == WORD_NAMESPACE + "p":
+                    parts.append("".join(runs))
+                    length += len(parts[-1])
+                    runs = []
+                    element.clear()
+                    if length >= max_chars:
+                        break
+    else:
+        with open(path, "rb") as f:
+            parts.append(f.read(max_chars * 4).decode("utf-8-sig", errors="replace"))
+    text = re.sub(r"[^\S\n]+", " ", "\n".join(parts))
+    return re.sub(r"\n\s*\n+", "\n\n", text).strip()[:max_chars]
+
+
+class CVParser:
+    """Bounded queue of CV parsing jobs, drained into a process pool.
+
+    Extraction is CPU-bound (PDF layout analysis, XML parsing), so it runs in
+    worker processes and never on the event loop. Submissions beyond the queue
+    capacity are refused instead of piling up. Finished jobs are kept for status
+    polling until `max_jobs` newer ones push them out.
+    """
+
+    def __init__(self, workers: int = 1, queue_size: int = 64, max_jobs: int = 10_000):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_jobs = max_jobs
+        self.jobs: "OrderedDict[str, dict]" = OrderedDict()
+        self.totals: Counter = Counter()
+        self._recent: deque = deque(maxlen=1000)  # (finished at, seconds, bytes) of recent jobs
+        self._queue: Optional[asyncio.Queue] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    def full(self) -> bool:
+        return self._queue is None or self._queue.full()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # Spawned rather than forked: the server process runs threads and an event loop.
+        return ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def start(self):
+        self._pool = self._new_pool()
+        self._queue = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def submit(self, org_id: str, candidate_id: str, stored: dict,
+               on_done: Callable[[str], Any]) -> Optional[dict]:
+        """Queue a stored CV for extraction; None when the queue is full"""
+        job = {
+            "id": secrets.token_hex(8),
+            "organization_id": org_id,
+            "candidate_id": candidate_id,
+            "status": "queued",
+            "kind": stored["kind"],
+            "size": stored["size"],
+            "sha256": stored["sha256"],
+            "submitted_at": datetime.now(),
+            "started_at": None,
+            "finished_at": None,
+            "text_length": None,
+            "error": None,
+        }
+        try:
+            self._queue.put_nowait((job, stored["path"], on_done))
+        except (asyncio.QueueFull, AttributeError):
+            self.totals["rejected"] += 1
+            return None
+        self.jobs[job["id"]] = job
+        while len(self.jobs) > self.max_jobs:
+            self.jobs.popitem(last=False)
+        return job
+
+    async def _work(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job, path, on_done = await self._queue.get()
+            job["status"] = "processing"
+            job["started_at"] = datetime.now()
+            started = time.perf_counter()
+            try:
+                text = await loop.run_in_executor(self._pool, extract_cv_text, path, job["kind"])
+                await on_done(text)
+                job["status"], job["text_length"] = "done", len(text)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if isinstance(exc, BrokenProcessPool):
+                    # A worker died (e.g. out of memory on a hostile file); start a fresh pool.
+                    self._pool = self._new_pool()
+                job["status"], job["error"] = "failed", f"{type(exc).__name__}: {exc}"
+            finally:
+                job["finished_at"] = datetime.now()
+                elapsed = time.perf_counter() - started
+                self.totals[job["status"]] += 1
+                self.totals["bytes"] += job["size"]
+                self._recent.append((time.time(), elapsed, job["size"]))
+                self._queue.task_done()
+
+    def metrics(self, window: float = 60.0) -> dict:
+        now = time.time()
+        recent = [entry for entry in self._recent if now - entry[0] <= window]
+        durations = sorted(seconds for _, seconds, _ in recent)
+        return {
+            "running": self.running,
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self.queue_size,
+            "jobs_by_status": dict(Counter(job["status"] for job in self.jobs.values())),
+            "completed": self.totals["done"],
+            "failed": self.totals["failed"],
+            "rejected": self.totals["rejected"],
+            "bytes_processed": self.totals["bytes"],
+            "last_window": {
+                "seconds": window,
+                "jobs": len(recent),
+                "jobs_per_second": round(len(recent) / window, 3),
+                "bytes_per_second": round(sum(size for _, _, size in recent) / window, 1),
+                "p50_seconds": round(percentile(durations, 50), 4) if durations else None,
+                "p95_seconds": round(percentile(durations, 95), 4) if durations else None,
+            },
+        }
+
+
+cv_parser = CVParser(workers=int(os.getenv("CV_PARSER_WORKERS", "1")),
+                     queue_size=int(os.getenv("CV_QUEUE_SIZE", "64")))
+startup_hooks.append(cv_parser.start)
+shutdown_hooks.append(cv_parser.stop)
+
+
+def capped_receive(receive, limit: int, detail: str):
+    """A receive callable failing with 413 as soon as the request body passes limit bytes.
+
+    Enforces the limit while the body streams in, whether or not the client sent
+    Content-Length (or told the truth in it).
+    """
+    received = 0
+
+    async def receive_capped():
+        nonlocal received
+        message = await receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > limit:
+                raise HTTPException(status_code=413, detail=detail)
+        return message
+    return receive_capped
+
+
+def cv_queue_full() -> HTTPException:
+    return HTTPException(status_code=503, detail="CV parsing queue is full, retry shortly",
+                         headers={"Retry-After": "5"})
+
+
+@app.post("/api/candidates/{candidate_id}/cv", status_code=202)
+async def upload_candidate_cv(candidate_id: str, request: Request, tenant: TenantStore = Depends(get_tenant)):
+    """Upload a CV (PDF, DOCX or plain text) as multipart field "file"; its text is extracted in the background"""
+    if candidate_id not in tenant.candidates:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    too_large = f"CVs are limited to {CV_MAX_BYTES} bytes"
+    if int(request.headers.get("content-length") or 0) > CV_MAX_BYTES + CV_MULTIPART_OVERHEAD:
+        raise HTTPException(status_code=413, detail=too_large)
+    if not cv_parser.running:
+        raise HTTPException(status_code=503, detail="CV parsing is not running")
+    if cv_parser.full():
+        raise cv_queue_full()
+
+    # Starlette spools file parts to a temporary file once they outgrow 1 MiB; the capped
+    # receive stops a chunked upload at the limit instead of after spooling all of it.
+    body = capped_receive(request.receive, CV_MAX_BYTES + CV_MULTIPART_OVERHEAD, too_large)
+    form = await Request(request.scope, body).form(max_files=1, max_fields=10)
+    try:
+        upload = form.get("file")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(status_code=400, detail='Expected a multipart file field named "file"')
+        try:
+            stored = await run_in_threadpool(store_cv_file, upload.file, tenant)
+        except UnsupportedCV as exc:
+            raise HTTPException(status_code=413 if isinstance(exc, CVTooLarge) else 415, detail=str(exc))
+        filename = upload.filename
+    finally:
+        await form.close()
+
+    async def apply_text(text: str):
+        async with tenant.gate.write():
+            # Skip if the candidate was deleted or has uploaded another CV since.
+            if tenant.cv_files.get(candidate_id, {}).get("sha256") == stored["sha256"]:
+                tenant.candidates.patch(candidate_id, {"cv_text": text, "updated_at": datetime.now()})
+
+    if candidate_id not in tenant.candidates:  # deleted while the file was being stored
+        tenant.release_cv(stored)
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    job = cv_parser.submit(tenant.org_id, candidate_id, stored, apply_text)
+    if job is None:
+        tenant.release_cv(stored)
+        raise cv_queue_full()
+    tenant.attach_cv(candidate_id, {**stored, "filename": filename, "content_type": CV_CONTENT_TYPES[stored["kind"]],
+                                    "uploaded_at": datetime.now()})
+    return {"job_id": job["id"], "status": job["status"], "status_url": f"/api/cv/jobs/{job['id']}"}
+
+@app.get("/api/cv/jobs/{job_id}")
+async def get_cv_job(job_id: str, tenant: TenantStore = Depends(get_tenant)):
+    """Status of a CV parsing job"""
+    job = cv_parser.jobs.get(job_id)
+    if job is None or job["organization_id"] != tenant.org_id:
+        raise HTTPException(status_code=404, detail="CV job not found")
+    return job
+
+# ==================== CV File Serving ====================
+
+CV_CHUNK_SIZE = 1024 * 1024
+BYTE_RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """First and last byte of a single-range Range header, or None to send the whole file.
+
+    Multi-range and non-byte requests are answered with the full file, which
+    RFC 9110 allows; an unsatisfiable range raises ValueError.
+    """
+    match = BYTE_RANGE.fullmatch(header.strip())
+    if match is None or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        if int(last) == 0:
+            raise ValueError("empty suffix range")
+        return max(size - int(last), 0), size - 1
+    start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError("range outside the file")
+    return start, end
+
+
+def etag_matches(header: Optional[str], tag: str) -> bool:
+    """Weak comparison of an If-None-Match header against a strong ETag"""
+    if header is None:
+        return False
+    return header.strip() == "*" or tag in (t.strip().removeprefix("W/") for t in header.split(","))
+
+
+class FileRangeResponse(Response):
+    """Sends part of a file, zero-copy when the ASGI server offers a way to.
+
+    With the `http.response.zerocopysend` extension the server sendfile()s the
+    range itself; with `http.response.pathsend` it does so for whole files. Other
+    servers get the range read straight from the file descriptor in 1 MiB chunks
+    off the event loop, without buffering the file.
+    """
+
+    def __init__(self, path: str, offset: int, count: int, status_code: int, headers: Dict[str, str]):
+        super().__init__(status_code=status_code, headers={**headers, "Content-Length": str(count)})
+        self.path = path
+        self.offset = offset
+        self.count = count
+
+    async def __call__(self, scope, receive, send):
+        try:
+            file = await run_in_threadpool(open, self.path, "rb")
+        except FileNotFoundError:
+            await JSONResponse({"detail": "CV file is missing from storage"}, status_code=404)(scope, receive, send)
+            return
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            extensions = scope.get("extensions") or {}
+            whole_file = self.offset == 0 and self.count == os.fstat(file.fileno()).st_size
+            if "http.response.zerocopysend" in extensions:
+                await send({"type": "http.response.zerocopysend", "file": file,
+                            "offset": self.offset, "count": self.count})
+            elif "http.response.pathsend" in extensions and whole_file:
+                await send({"type": "http.response.pathsend", "path": self.path})
+            else:
+                position, remaining = self.offset, self.count
+                while remaining > 0:
+                    chunk = await run_in_threadpool(os.pread, file.fileno(), min(CV_CHUNK_SIZE, remaining), position)
+                    if not chunk:
+                        break
+                    position += len(chunk)
+                    remaining -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+                if remaining > 0:
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            file.close()
+
+
+@app.get("/api/candidates/{candidate_id}/cv")
+async def download_candidate_cv(
+    candidate_id: str,
+    request: Request,
+    download: bool = False,
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Download a candidate's CV, with Range and conditional request support"""
+    stored = tenant.cv_files.get(candidate_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="No CV uploaded for this candidate")
+
+    # Files are stored under their SHA-256, so the ETag is known without reading them.
+    tag = f'"{stored["sha256"]}"'
+    modified = stored["uploaded_at"].astimezone(timezone.utc).replace(microsecond=0)
+    filename = stored["filename"] or f"cv-{candidate_id}"
+    headers = {
+        "ETag": tag,
+        "Last-Modified": format_datetime(modified, usegmt=True),
+        "Cache-Control": "private, no-cache",
+        "Accept-Ranges": "bytes",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, tag):
+        return Response(status_code=304, headers=headers)
+    if if_none_match is None and "if-modified-since" in request.headers:
+        try:
+            if parsedate_to_datetime(request.headers["if-modified-since"]) >= modified:
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass  # an unparseable date is ignored, as RFC 9110 requires
+
+    headers["Content-Type"] = stored["content_type"]
+    headers["Content-Disposition"] = (f"{'attachment' if download else 'inline'}; "
+                                      f"filename*=UTF-8''{quote(filename)}")
+    size = stored["size"]
+    byte_range = None
+    if "range" in request.headers and request.headers.get("if-range", tag).strip() == tag:
+        try:
+            byte_range = parse_byte_range(request.headers["range"], size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    if byte_range is None:
+        return FileRangeResponse(stored["path"], 0, size, 200, headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return FileRangeResponse(stored["path"], start, end - start + 1, 206, headers)
+
+# ==================== Batch Requests ====================
+
+BATCH_PATH = "/api/batch"
+BATCH_MAX_REQUESTS = 20
+
+
+class BatchItem(BaseModel):
+    method: str = "GET"
+    path: str
+    body: Optional[Any] = None
+    headers: Dict[str, str] = {}
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem]
+
+
+async def dispatch_in_process(parent_scope: dict, item: BatchItem) -> bytes:
+    """Run one sub-request through the ASGI app without touching the network"""
+    url = urlsplit(item.path)
+    body = json.dumps(item.body).encode() if item.body is not None else b""
+    own_headers = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in item.headers.items()]
+    # The item's own headers (If-Match, ...) replace the envelope's copies rather than trailing them.
+    dropped = {b"content-length", b"content-type", b"accept-encoding", b"idempotency-key"}
+    dropped.update(k for k, _ in own_headers)
+    headers = [(k, v) for k, v in parent_scope["headers"] if k not in dropped] + own_headers
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    scope = {
+        **parent_scope,
+        "method": item.method.upper(),
+        "path": unquote(url.path),
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+        "state": {**parent_scope.get("state", {}), "in_batch": True},
+    }
+    for key in ("route", "endpoint", "path_params", "router", "fastapi_astack", "app_root_path"):
+        scope.pop(key, None)
+
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if request_sent:
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status = 500
+    response_headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers.update((k.decode("latin-1"), v.decode("latin-1")) for k, v in message["headers"])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+
+    payload = b"".join(chunks)
+    if not (response_headers.get("content-type", "").startswith("application/json") and payload):
+        payload = json.dumps(payload.decode("utf-8", errors="replace")).encode()
+    # JSON bodies are spliced into the batch envelope as-is instead of being re-encoded.
+    return b'{"status":%d,"headers":%s,"body":%s}' % (status, json.dumps(response_headers).encode(), payload)
+
+
+@app.post(BATCH_PATH)
+async def batch_requests(batch: BatchRequest, request: Request, tenant: TenantStore = Depends(get_tenant)):
+    """Run several API calls against one consistent store snapshot and return all results"""
+    if not 0 < len(batch.requests) <= BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"A batch holds 1 to {BATCH_MAX_REQUESTS} requests")
+    for item in batch.requests:
+        if not item.path.startswith("/") or unquote(urlsplit(item.path).path) == BATCH_PATH:
+            raise HTTPException(status_code=400, detail=f"Invalid batch path: {item.path}")
+        if any(name.lower() == TENANT_HEADER.lower() for name in item.headers):
+            # Sub-requests run under the batch's tenant gate, so they cannot switch tenants.
+            raise HTTPException(status_code=400, detail=f"Batch items cannot set {TENANT_HEADER}")
+
+    has_writes = any(item.method.upper() not in READ_METHODS for item in batch.requests)
+    async with tenant.gate.snapshot(exclusive=has_writes):
+        if has_writes:
+            # Writes run in order so later sub-requests observe earlier ones.
+            results = [await dispatch_in_process(request.scope, item) for item in batch.requests]
+        else:
+            results = await asyncio.gather(*(dispatch_in_process(request.scope, item) for item in batch.requests))
+    return Response(content=b'{"responses":[' + b",".join(results) + b"]}", media_type="application/json")
+
+# ==================== Idempotency Keys ====================
+
+class IdempotencyStore:
+    """Request fingerprints and their responses, bounded by count and bytes, with a TTL"""
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        self._evict_expired()
+        return self._entries.get(key)
+
+    def begin(self, key: str, fingerprint: str) -> dict:
+        entry = {
+            "fingerprint": fingerprint,
+            "expires_at": time.monotonic() + self.ttl,
+            "done": asyncio.get_running_loop().create_future(),
+            "response": None,
+            "size": 0,
+        }
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._pop_oldest()
+        return entry
+
+    def complete(self, key: str, entry: dict, response: Optional[tuple]):
+        """Record the outcome; None or a 5xx response lets a retry run the request again"""
+        if response is None or response[0] >= 500:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+        elif self._entries.get(key) is entry:
+            entry["response"] = response
+            entry["size"] = len(response[2])
+            self.size += entry["size"]
+            while self.size > self.max_bytes and self._entries:
+                self._pop_oldest()
+        if not entry["done"].done():
+            entry["done"].set_result(response)
+
+    def _pop_oldest(self):
+        _, entry = self._entries.popitem(last=False)
+        self.size -= entry["size"]
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if entry["expires_at"] > now or not entry["done"].done():
+                break
+            self._pop_oldest()
+
+
+class BodyTooLarge(Exception):
+    """A request body ran past the limit it was read under"""
+
+
+async def read_body(receive, limit: Optional[int] = None) -> Optional[bytes]:
+    """The whole request body, or None if the client disconnected first.
+
+    With a limit, raises BodyTooLarge as soon as more than limit bytes have arrived,
+    so a chunked body without Content-Length is never buffered past it.
+    """
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if limit is not None and size > limit:
+            raise BodyTooLarge(size)
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def replay_body(body: bytes, receive):
+    """A receive callable handing a body already read to the app, then passing through"""
+    body_sent = False
+
+    async def replay_receive():
+        nonlocal body_sent
+        if body_sent:
+            return await receive()
+        body_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+    return replay_receive
+
+
+class IdempotencyMiddleware:
+    """Honour Idempotency-Key on POST requests.
+
+    The first request with a key runs normally and its response is stored. Retries
+    with the same key and body replay the stored response, concurrent duplicates
+    wait for the first one to finish, and reusing a key for a different request is
+    rejected with 422. The body has to be read whole before it can be fingerprinted,
+    so keyed requests over max_body bytes are refused with 413 rather than run
+    without the guarantee. Keys are stored per worker process.
+    """
+
+    def __init__(self, app, ttl: float = 24 * 3600, max_entries: int = 10_000,
+                 max_bytes: int = 64 * 1024 * 1024, max_body: int = 16 * 1024 * 1024,
+                 partition_header: Optional[str] = None):
+        self.app = app
+        self.store = IdempotencyStore(ttl, max_entries, max_bytes)
+        self.max_body = max_body
+        self.partition_header = partition_header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        key = headers.get("idempotency-key")
+        if key is None or headers.get("content-type", "").startswith("multipart/"):
+            await self.app(scope, receive, send)
+            return
+        if not 0 < len(key) <= 255:
+            await JSONResponse({"detail": "Idempotency-Key must be 1 to 255 characters"}, status_code=400)(
+                scope, receive, send)
+            return
+        if self.partition_header:
+            # Two tenants picking the same key must not see each other's responses.
+            key = f"{headers.get(self.partition_header, '')}\0{key}"
+
+        too_large = JSONResponse(
+            {"detail": f"Requests with an Idempotency-Key are limited to {self.max_body} bytes"}, status_code=413)
+        if int(headers.get("content-length") or 0) > self.max_body:
+            await too_large(scope, receive, send)
+            return
+        try:
+            body = await read_body(receive, self.max_body)
+        except BodyTooLarge:
+            await too_large(scope, receive, send)
+            return
+        if body is None:
+            return
+        digest = hashlib.sha256()
+        for part in (scope["path"].encode(), scope.get("query_string", b""), body):
+            digest.update(part)
+            digest.update(b"\0")
+        fingerprint = digest.hexdigest()
+
+        while True:
+            entry = self.store.get(key)
+            if entry is None:
+                break
+            if entry["fingerprint"] != fingerprint:
+                await JSONResponse(
+                    {"detail": "Idempotency-Key was already used with a different request"}, status_code=422
+                )(scope, receive, send)
+                return
+            response = entry["response"] or await asyncio.shield(entry["done"])
+            if response is not None:
+                await self._replay(response, send)
+                return
+            # The first request failed before producing a response; run this one instead.
+
+        entry = self.store.begin(key, fingerprint)
+        captured = {"status": 500, "headers": [], "body": []}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                captured["body"].append(message.get("body", b""))
+            await send(message)
+
+        response = None
+        try:
+            await self.app(scope, replay_body(body, receive), capture_send)
+            response = (captured["status"], captured["headers"], b"".join(captured["body"]))
+        finally:
+            self.store.complete(key, entry, response)
+
+    @staticmethod
+    async def _replay(response: tuple, send):
+        status, headers, body = response
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": headers + [(b"idempotent-replayed", b"true")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+# ==================== Admission Control ====================
+
+class PriorityLimiter:
+    """Counting semaphore whose waiters are admitted lowest priority value first"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_use = 0
+        self.waiting = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    async def acquire(self, priority: int, timeout: float) -> bool:
+        if self.in_use < self.capacity and not self.waiting:
+            self.in_use += 1
+            return True
+        if timeout <= 0:
+            return False
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self.waiting += 1
+        try:
+            # A slot handed over by release() counts as acquired even if the timeout races it.
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.waiting -= 1
+
+    def release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(True)
+                return
+        self.in_use -= 1
+
+
+class AdmissionController:
+    """Per-route concurrency limits plus a global in-flight cap, with priority lanes.
+
+    Health checks bypass admission entirely. Reads, writes and bulk writes each
+    have a route concurrency limit and a queue-time budget; when a request cannot
+    be admitted within its budget it fails fast with 503 and Retry-After instead
+    of piling up behind a bulk import. Queued requests are admitted reads first.
+    A batch is admitted in the lane of its most demanding sub-request, so a
+    read-only dashboard batch counts as a read.
+    """
+
+    BYPASS_PATHS = frozenset({"/", "/api/health"})
+    BULK_SUFFIXES = ("/bulk", "/import")
+    # Shared by every request no route matches, so stray paths cannot each allocate a limiter.
+    UNMATCHED_ROUTE = ("*", "<unmatched>")
+    # lane: (priority, per-route concurrency, queue budget in seconds, Retry-After seconds)
+    LANES = {
+        "read": (1, 64, 1.0, 1),
+        "write": (2, 32, 2.0, 2),
+        "bulk": (3, 4, 0.25, 5),
+    }
+
+    def __init__(self, app, max_inflight: int = 128, max_queue: int = 512):
+        self.app = app
+        self.max_queue = max_queue
+        self.inflight = PriorityLimiter(max_inflight)
+        self.route_limiters: Dict[Tuple[str, str, str], PriorityLimiter] = {}
+        self.rejected = Counter()
+
+    def lane(self, scope) -> str:
+        if scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            return "read"
+        return "bulk" if scope["path"].rstrip("/").endswith(self.BULK_SUFFIXES) else "write"
+
+    def batch_lane(self, body: bytes) -> str:
+        """A batch waits in the lane of its most demanding sub-request"""
+        try:
+            items = json.loads(body)["requests"]
+            lanes = [self.lane({"method": str(item.get("method", "GET")).upper(), "path": unquote(urlsplit(item["path"]).path)})
+                     for item in items]
+        except (ValueError, LookupError, TypeError, AttributeError):
+            return "write"  # malformed; validation rejects it once admitted
+        return max(lanes, key=lambda lane: self.LANES[lane][0], default="read")
+
+    def route_limiter(self, scope, lane: str) -> PriorityLimiter:
+        route_key = self.UNMATCHED_ROUTE
+        for route in app.router.routes:
+            if route.matches(scope)[0] == Match.FULL:
+                route_key = (scope["method"], route.path)
+                break
+        # Batches of different lanes share a path but not a concurrency limit.
+        key = (lane, *route_key)
+        limiter = self.route_limiters.get(key)
+        if limiter is None:
+            limiter = self.route_limiters[key] = PriorityLimiter(self.LANES[lane][1])
+        return limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.BYPASS_PATHS \
+                or scope.get("state", {}).get("in_batch"):
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "POST" and scope["path"] == BATCH_PATH:
+            body = await read_body(receive)
+            if body is None:
+                return
+            lane = self.batch_lane(body)
+            receive = replay_body(body, receive)
+        else:
+            lane = self.lane(scope)
+        priority, _, budget, retry_after = self.LANES[lane]
+        deadline = time.monotonic() + budget
+        route_limiter = self.route_limiter(scope, lane)
+
+        admitted_route = admitted = False
+        if self.inflight.waiting < self.max_queue:
+            admitted_route = await route_limiter.acquire(priority, budget)
+            if admitted_route:
+                admitted = await self.inflight.acquire(priority, deadline - time.monotonic())
+        if not admitted:
+            if admitted_route:
+                route_limiter.release()
+            self.rejected[lane] += 1
+            await JSONResponse(
+                {"detail": "Server is busy, please retry later"},
+                status_code=503,
+                headers={"Retry-After": str(retry_after)}
+            )(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.inflight.release()
+            route_limiter.release()
+
+# ==================== Rate Limiting ====================
+
+# Budgets follow actionRateLimits in src/lib/middleware/action-rate-limit.ts (and
+# determine_rate_limit_type in scripts/add-rate-limiting*.py): (max requests, window seconds).
+# No route here calls a model yet, so nothing maps to "ai"; analytics are dashboard reads
+# and count against "default".
+RATE_LIMITS = {
+    "default": (60, 60.0),
+    "create": (20, 60.0),
+    "bulk": (10, 60.0),
+    "ai": (5, 60.0),
+}
+
+
+def determine_rate_limit_type(method: str, path: str) -> str:
+    """Map a request to its rate-limit category: bulk, create or default"""
+    if path.rstrip("/").endswith(("/bulk", "/import")):
+        return "bulk"
+    if method == "POST":
+        return "create"
+    return "default"
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by (client, category), split across lock-guarded shards.
+
+    Buckets refill lazily when touched. Each shard keeps its buckets in LRU order,
+    so idle buckets (which would be full again anyway) are evicted from the front
+    in amortized O(1), and a hard per-shard cap bounds memory under key floods.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[int, float]], shards: int = 16, max_keys_per_shard: int = 4096):
+        self.limits = limits
+        self.max_keys_per_shard = max_keys_per_shard
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+
+    def hit(self, client: str, category: str) -> Tuple[bool, int, float]:
+        """Take one token; returns (allowed, tokens left, seconds until the next token)"""
+        capacity, window = self.limits[category]
+        rate = capacity / window
+        key = (client, category)
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = [float(capacity), now]
+            else:
+                buckets.move_to_end(key)
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            allowed = bucket[0] >= 1
+            if allowed:
+                bucket[0] -= 1
+            tokens = bucket[0]
+            self._evict(buckets, now)
+        return allowed, int(tokens), (1 - tokens) / rate if tokens < 1 else 0.0
+
+    def _evict(self, buckets: OrderedDict, now: float):
+        while buckets:
+            (client, category), (_, last_seen) = next(iter(buckets.items()))
+            if now - last_seen < self.limits[category][1] and len(buckets) <= self.max_keys_per_shard:
+                break
+            buckets.popitem(last=False)
+
+    def __len__(self) -> int:
+        return sum(len(buckets) for _, buckets in self._shards)
+
+
+class RateLimitMiddleware:
+    """Reject clients over their per-category budget with 429 and Retry-After.
+
+    A batch is not charged itself; each of its sub-requests is charged to its own
+    category under the batch's client key, and one over budget gets its own 429.
+    """
+
+    EXEMPT_PATHS = frozenset({"/", "/api/health"})
+
+    def __init__(self, app, limiter: TokenBucketLimiter, key_header: Optional[str] = None):
+        self.app = app
+        self.limiter = limiter
+        self.key_header = key_header.lower() if key_header else None
+
+    def client_key(self, scope) -> str:
+        batch_key = scope.get("state", {}).get("rate_limit_key")
+        if batch_key is not None:
+            return batch_key  # a sub-request cannot pick another client's bucket through its own headers
+        if self.key_header:
+            value = Headers(scope=scope).get(self.key_header)
+            if value:
+                return value
+        client = scope.get("client")
+        return client[0] if client else "anonymous"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] == BATCH_PATH and not scope.get("state", {}).get("in_batch"):
+            scope.setdefault("state", {})["rate_limit_key"] = self.client_key(scope)
+            await self.app(scope, receive, send)
+            return
+
+        category = determine_rate_limit_type(scope["method"], scope["path"])
+        allowed, remaining, retry_after = self.limiter.hit(self.client_key(scope), category)
+        limit_headers = {
+            "X-RateLimit-Limit": str(self.limiter.limits[category][0]),
+            "X-RateLimit-Remaining": str(remaining),
+        }
+        if not allowed:
+            await JSONResponse(
+                {"detail": f"Rate limit exceeded. Please try again in {math.ceil(retry_after)} seconds.",
+                 "code": "RATE_LIMIT_EXCEEDED"},
+                status_code=429,
+                headers={**limit_headers, "Retry-After": str(math.ceil(retry_after))}
+            )(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in limit_headers.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+# ==================== Admin: Sampling Profiler ====================
+
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+
+# Starlette enters Route.handle for every routed request and keeps it on the
+# stack until the response is sent, so its frame tells us which route a sample
+# belongs to without any per-request bookkeeping while the profiler is idle.
+_ROUTE_HANDLE_CODES = frozenset(
+    cls.__dict__["handle"].__code__ for cls in (Route, APIRoute) if "handle" in cls.__dict__
+)
+
+_profiler_lock = threading.Lock()
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """Guard admin routes behind the ADMIN_API_TOKEN shared secret"""
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_API_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling the stacks of every live thread"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.duration = 0.0
+
+    def run(self, seconds: float) -> "SamplingProfiler":
+        own_thread = threading.get_ident()
+        started = time.perf_counter()
+        deadline = started + seconds
+        while time.perf_counter() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_thread:
+                    self.samples[self._collapse(frame)] += 1
+            self.sample_count += 1
+            time.sleep(self.interval)
+        self.duration = time.perf_counter() - started
+        return self
+
+    @staticmethod
+    def _collapse(frame) -> Tuple[Optional[str], Tuple[Tuple[str, str, int], ...]]:
+        route = None
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            if route is None and code in _ROUTE_HANDLE_CODES:
+                handled = frame.f_locals.get("self")
+                methods = ",".join(sorted(getattr(handled, "methods", None) or ()))
+                route = f"{methods} {getattr(handled, 'path', '?')}".strip()
+            stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        stack.reverse()
+        return route, tuple(stack)
+
+    def iter_stacks(self, include_idle: bool):
+        for (route, stack), count in self.samples.items():
+            if route is None and not include_idle:
+                continue
+            yield route or "(no route)", stack, count
+
+    def to_collapsed(self, include_idle: bool = False) -> str:
+        """Brendan Gregg collapsed-stack format, one `a;b;c count` line per stack"""
+        lines = []
+        for route, stack, count in self.iter_stacks(include_idle):
+            frames = ";".join(f"{name} ({os.path.basename(filename)}:{line})" for name, filename, line in stack)
+            lines.append(f"{route};{frames} {count}")
+        lines.sort()
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, include_idle: bool = False) -> dict:
+        """speedscope.app file format with one sampled profile per route"""
+        frames: List[dict] = []
+        frame_index: Dict[Tuple[str, str, int], int] = {}
+        profiles: Dict[str, dict] = {}
+        for route, stack, count in self.iter_stacks(include_idle):
+            indexes = []
+            for key in stack:
+                if key not in frame_index:
+                    frame_index[key] = len(frames)
+                    frames.append({"name": key[0], "file": key[1], "line": key[2]})
+                indexes.append(frame_index[key])
+            profile = profiles.setdefault(route, {
+                "type": "sampled",
+                "name": route,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": 0,
+                "samples": [],
+                "weights": [],
+            })
+            profile["samples"].append(indexes)
+            profile["weights"].append(count * self.interval)
+            profile["endValue"] += count * self.interval
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": sorted(profiles.values(), key=lambda p: -p["endValue"]),
+            "name": f"TargetYM API profile ({self.duration:.1f}s)",
+            "exporter": "targetym-sampling-profiler",
+        }
+
+
+@app.get("/api/admin/profile", dependencies=[Depends(require_admin)])
+async def profile_process(
+    seconds: float = Query(default=10.0, gt=0, le=120),
+    interval_ms: float = Query(default=5.0, ge=1, le=100),
+    format: str = Query(default="collapsed", pattern="^(collapsed|speedscope)$"),
+    include_idle: bool = False
+):
+    """Sample the live process for N seconds and return a per-route profile"""
+    if not _profiler_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already being recorded")
+    try:
+        profiler = await run_in_threadpool(SamplingProfiler(interval_ms / 1000).run, seconds)
+    finally:
+        _profiler_lock.release()
+
+    if format == "speedscope":
+        return JSONResponse(profiler.to_speedscope(include_idle))
+    return PlainTextResponse(profiler.to_collapsed(include_idle))
+
+
+@app.get("/api/admin/tenants", dependencies=[Depends(require_admin)])
+async def tenant_memory(limit: int = Query(default=50, ge=1, le=1000)):
+    """Approximate memory held by each tenant's store, largest first"""
+    usage = sorted((tenant.memory_usage() for tenant in tenants), key=lambda u: u["total_bytes"], reverse=True)
+    return {
+        "tenant_count": len(usage),
+        "total_bytes": sum(u["total_bytes"] for u in usage),
+        "tenants": usage[:limit],
+    }
+
+
+@app.get("/api/admin/cv-parser", dependencies=[Depends(require_admin)])
+async def cv_parser_metrics():
+    """Queue depth, outcomes and recent throughput of CV parsing"""
+    return cv_parser.metrics()
+
+
+@app.get("/api/admin/startup", dependencies=[Depends(require_admin)])
+async def startup_report():
+    """Where cold start time went, and which heavy imports have been deferred so far"""
+    return {
+        "phases_ms": startup_phases,
+        "openapi_schema": openapi_schema_source,
+        "deferred_modules_loaded": {name: name in sys.modules for name in ("numpy", "pypdf", "uvicorn")},
+    }
+
+
+@app.post("/api/admin/archive/candidates", dependencies=[Depends(require_admin)])
+async def archive_stale_candidates(
+    request: Request,
+    older_than_days: float = Query(default=ARCHIVE_AFTER_DAYS, ge=0),
+    tenant: TenantStore = Depends(get_tenant)
+):
+    """Move the tenant's stale rejected and hired candidates to cold storage now"""
+    result = await archive_candidates(tenant, older_than_days, in_batch=getattr(request.state, "in_batch", False))
+    return {**result, "archive": tenant.archive.usage()}
+
+
+@app.get("/api/admin/scheduler", dependencies=[Depends(require_admin)])
+async def scheduler_metrics():
+    """Pending timers and reminder outbox throughput"""
+    return {"scheduler": scheduler.metrics(), "reminder_outbox": reminder_outbox.metrics()}
+
+# ==================== Middleware Stack ====================
+# Registered innermost first: idempotent replays are stored before compression so a
+# replay is re-encoded for whatever Accept-Encoding the retry sends.
+
+app.add_middleware(
+    IdempotencyMiddleware,
+    ttl=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600))),
+    max_entries=int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000")),
+    max_body=int(os.getenv("IDEMPOTENCY_MAX_BODY_BYTES", str(16 * 1024 * 1024))),
+    partition_header=TENANT_HEADER,
+)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+    cache_bytes=int(os.getenv("COMPRESSION_CACHE_BYTES", str(32 * 1024 * 1024))),
+    partition_header=TENANT_HEADER,
+)
+app.add_middleware(
+    AdmissionController,
+    max_inflight=int(os.getenv("ADMISSION_MAX_INFLIGHT", "128")),
+    max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "512")),
+)
+# Off unless configured: the Next.js server is the only direct caller, so keyed by client
+# address every user would share one budget. Enable it with RATE_LIMIT_KEY_HEADER naming a
+# header that server fills in per user (e.g. x-user-id); RATE_LIMIT_ENABLED=1 alone keys by
+# client address, for deployments where users reach the API directly.
+RATE_LIMIT_KEY_HEADER = os.getenv("RATE_LIMIT_KEY_HEADER")
+if os.getenv("RATE_LIMIT_ENABLED", "1" if RATE_LIMIT_KEY_HEADER else "0") == "1":
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=TokenBucketLimiter(RATE_LIMITS),
+        key_header=RATE_LIMIT_KEY_HEADER,
+    )
+
+# CORS Configuration for Next.js. Registered last so it is outermost: preflights are answered
+# before rate limiting and admission control, and their 429s and 503s still carry the CORS headers.
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=[
+        "http://localhost:3000",
+        "http://localhost:3001",
+        "https://*.vercel.app"
+    ],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# ==================== Startup Artifacts ====================
+# `python main.py --build-artifacts` at build time saves the OpenAPI schema, which
+# FastAPI would otherwise generate (~100 ms) on the first /docs or /openapi.json hit.
+
+OPENAPI_ARTIFACT = os.getenv("OPENAPI_ARTIFACT",
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), "build", "openapi.json"))
+openapi_schema_source = "generated on first request"
+
+
+def app_fingerprint() -> str:
+    """Identifies the code and framework versions an artifact was built from"""
+    digest = hashlib.sha256()
+    with open(__file__, "rb") as f:
+        digest.update(f.read())
+    for module in ("fastapi", "pydantic"):
+        digest.update(sys.modules[module].__version__.encode())
+    return digest.hexdigest()
+
+
+def build_artifacts(path: str = OPENAPI_ARTIFACT) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".part", "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": app_fingerprint(), "openapi": app.openapi()}, f, separators=(",", ":"))
+    os.replace(path + ".part", path)
+    return path
+
+
+async def load_openapi_artifact():
+    """Serve the prebuilt OpenAPI schema if it was built from this exact code"""
+    global openapi_schema_source
+    try:
+        with open(OPENAPI_ARTIFACT, encoding="utf-8") as f:
+            artifact = json.load(f)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable OpenAPI artifact %s: %s", OPENAPI_ARTIFACT, exc)
+        return
+    if artifact.get("fingerprint") != app_fingerprint():
+        openapi_schema_source = "stale artifact ignored"
+        logger.warning("Ignoring OpenAPI artifact %s built from other code; rebuild it", OPENAPI_ARTIFACT)
+        return
+    app.openapi_schema = artifact["openapi"]
+    openapi_schema_source = "artifact"
+
+
+startup_hooks.append(load_openapi_artifact)
+end_phase("app_definition")
+
+# ==================== Run Server ====================
+
+logger = logging.getLogger("targetym")
+
+
+def production_config(host: str, port: int) -> "uvicorn.Config":
+    """uvicorn settings for Render: fast loop/parser when installed, long keep-alive"""
+    import uvicorn
+
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        loop=loop,
+        http=http,
+        lifespan="on",
+        # Outlive the load balancer's idle timeout so it never reuses a socket we closed.
+        timeout_keep_alive=int(os.getenv("KEEP_ALIVE_TIMEOUT", "75")),
+        backlog=int(os.getenv("LISTEN_BACKLOG", "2048")),
+        # Render sends SIGKILL 30 seconds after SIGTERM; finish draining before that.
+        timeout_graceful_shutdown=int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "25")),
+        proxy_headers=True,
+        # Only these peers may set X-Forwarded-For; anyone else could pick their own client
+        # address. Set to the load balancer's addresses or CIDR ranges.
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        access_log=os.getenv("ACCESS_LOG", "0") == "1",
+        log_level="info",
+    )
+
+
+def serve_production(host: str, port: int):
+    """Single-process production server.
+
+    Every store (tenants, collections, schedules, archives) lives in this process's
+    memory, so a second worker would hold its own copy of the data and run its own
+    timers against the same outbox and archive files. Scale out only once storage
+    is shared.
+    """
+    import uvicorn
+
+    config = production_config(host, port)
+    logger.info("Starting server with loop=%s http=%s", config.loop, config.http)
+    uvicorn.Server(config).run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TargetYM API server")
+    parser.add_argument("--production", action="store_true",
+                        default=os.getenv("ENVIRONMENT") == "production",
+                        help="production server settings, no auto-reload (default when ENVIRONMENT=production)")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+                        help="must be 1: the stores are in-process memory, not shared between workers")
+    parser.add_argument("--build-artifacts", action="store_true",
+                        help=f"write the OpenAPI schema to {OPENAPI_ARTIFACT} (or $OPENAPI_ARTIFACT) and exit")
+    args = parser.parse_args()
+
+    if args.build_artifacts:
+        print(f"OpenAPI schema written to {build_artifacts()}")
+    elif args.workers != 1:
+        parser.error(f"--workers={args.workers} is not supported: each worker would hold its own "
+                     "in-memory stores, so data written through one would be missing from the others")
+    elif args.production:
+        logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+        serve_production(args.host, args.port)
+    else:
+        import uvicorn
+
+        uvicorn.run(
+            "main:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            log_level="info"
+        )
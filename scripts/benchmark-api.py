@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test for the FastAPI backend (main.py).
+
+Seeds the in-memory stores with deterministic candidates, interviews and jobs,
+then drives every API route through an in-process ASGI client and through a
+real local uvicorn server, recording throughput and p50/p95/p99 latency.
+Results can be saved as a baseline and later runs compared against it.
+
+Usage:
+    python scripts/benchmark-api.py --scale 10k
+    python scripts/benchmark-api.py --scale 100k --save-baseline
+    python scripts/benchmark-api.py --scale 1m --transport uvicorn --requests 500
+"""
+
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# A load test is one client by design; measure the routes, not the per-client rate limiter.
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_BASELINE_DIR = ROOT / "scripts" / "benchmarks"
+
+FIRST_NAMES = ["Amina", "Lucas", "Chloe", "Yanis", "Sofia", "Hugo", "Ines", "Noah", "Lea", "Adam", "Emma", "Karim"]
+LAST_NAMES = ["Martin", "Diallo", "Bernard", "Nguyen", "Dubois", "Traore", "Moreau", "Laurent", "Benali", "Petit"]
+DOMAINS = ["gmail.com", "outlook.com", "yahoo.fr", "proton.me", "targetym.io"]
+POSITIONS = ["Frontend Engineer", "Backend Engineer", "Data Analyst", "Product Manager", "HR Business Partner",
+             "Sales Executive", "DevOps Engineer", "UX Designer"]
+CANDIDATE_STATUSES = ["new", "screening", "interview", "offer", "hired", "rejected"]
+CANDIDATE_STATUS_WEIGHTS = [20, 15, 12, 5, 18, 30]
+SOURCES = ["linkedin", "referral", "careers-page", "indeed", "agency", None]
+DEPARTMENTS = ["Engineering", "Product", "Sales", "Marketing", "People", "Finance"]
+LOCATIONS = ["Paris", "Lyon", "Dakar", "Remote", "Casablanca", "Brussels"]
+JOB_TYPES = ["full-time", "part-time", "contract"]
+JOB_STATUSES = ["draft", "published", "closed"]
+INTERVIEW_TYPES = ["phone", "technical", "onsite", "culture"]
+INTERVIEW_STATUSES = ["scheduled", "completed", "cancelled"]
+CV_FILES = 100
+CV_BYTES = 256 * 1024
+WORDS = ("motivated experienced team player strong communication python react sql leadership remote "
+         "available immediately relocation salary expectations follow-up culture fit").split()
+
+# Routes deliberately left out of the load test.
+SKIPPED_ROUTES = {
+    ("GET", "/api/admin/profile"),
+    ("GET", "/api/admin/tenants"),
+    ("GET", "/api/admin/cv-parser"),
+    ("GET", "/api/admin/scheduler"),
+    ("GET", "/api/admin/startup"),
+    ("POST", "/api/admin/archive/candidates"),
+    # Needs the lifespan-managed process pool and multipart bodies; exercised by hand.
+    ("POST", "/api/candidates/{candidate_id}/cv"),
+    ("GET", "/api/cv/jobs/{job_id}"),
+}
+
+
+# ==================== Data Generation ====================
+
+class DataGenerator:
+    """Deterministic record factory shared by the seeder and the write scenarios"""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.epoch = datetime(2025, 1, 1)
+
+    def _timestamp(self) -> datetime:
+        return self.epoch + timedelta(seconds=self.rng.randrange(0, 365 * 24 * 3600))
+
+    def _text(self, min_words: int, max_words: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=self.rng.randint(min_words, max_words)))
+
+    def candidate(self, n: int) -> dict:
+        first = self.rng.choice(FIRST_NAMES)
+        last = self.rng.choice(LAST_NAMES)
+        return {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}{n}@{self.rng.choice(DOMAINS)}",
+            "phone": f"+33 6 {self.rng.randrange(10_000_000, 99_999_999)}",
+            "position": self.rng.choice(POSITIONS),
+            "status": self.rng.choices(CANDIDATE_STATUSES, CANDIDATE_STATUS_WEIGHTS)[0],
+            "source": self.rng.choice(SOURCES),
+            "cv_url": f"https://cdn.targetym.io/cv/{n}.pdf" if self.rng.random() < 0.7 else None,
+            "linkedin_url": f"https://linkedin.com/in/{first.lower()}-{last.lower()}-{n}" if self.rng.random() < 0.5 else None,
+            "notes": self._text(0, 60) or None,
+        }
+
+    def interview(self, candidate_count: int) -> dict:
+        return {
+            "candidate_id": str(self.rng.randint(1, max(candidate_count, 1))),
+            "type": self.rng.choice(INTERVIEW_TYPES),
+            "scheduled_at": self._timestamp().isoformat(),
+            "duration": self.rng.choice([30, 45, 60, 90]),
+            "location": self.rng.choice(LOCATIONS),
+            "meeting_url": None,
+            "interviewers": self.rng.sample(FIRST_NAMES, k=self.rng.randint(1, 3)),
+            "notes": self._text(0, 20) or None,
+            "status": self.rng.choice(INTERVIEW_STATUSES),
+        }
+
+    def job(self) -> dict:
+        salary_min = self.rng.randrange(30_000, 90_000, 1_000)
+        return {
+            "title": self.rng.choice(POSITIONS),
+            "department": self.rng.choice(DEPARTMENTS),
+            "location": self.rng.choice(LOCATIONS),
+            "type": self.rng.choice(JOB_TYPES),
+            "status": self.rng.choice(JOB_STATUSES),
+            "description": self._text(20, 80),
+            "requirements": self.rng.sample(WORDS, k=4),
+            "salary_min": salary_min,
+            "salary_max": salary_min + self.rng.randrange(5_000, 40_000, 1_000),
+        }
+
+
+def dataset_sizes(scale: int) -> Dict[str, int]:
+    return {"candidates": scale, "interviews": scale // 2, "jobs": max(scale // 20, 50),
+            "cvs": min(scale, CV_FILES)}
+
+
+def seed_store(scale: int, seed: int) -> Dict[str, int]:
+    """Fill main.py's stores directly, bypassing the API, and return the record counts"""
+    import main
+
+    gen = DataGenerator(seed)
+    sizes = dataset_sizes(scale)
+
+    main.tenants.default.clear()
+
+    for n in range(1, sizes["candidates"] + 1):
+        record = main.Candidate.model_construct(**gen.candidate(n)).model_dump()
+        record["created_at"] = record["updated_at"] = gen._timestamp()
+        main.candidates_db.insert(record)
+
+    for n in range(1, sizes["interviews"] + 1):
+        data = gen.interview(sizes["candidates"])
+        data["scheduled_at"] = datetime.fromisoformat(data["scheduled_at"])
+        record = main.Interview.model_construct(**data).model_dump()
+        record["created_at"] = gen._timestamp()
+        main.interviews_db.insert(record)
+
+    for n in range(1, sizes["jobs"] + 1):
+        record = main.JobPosting.model_construct(**gen.job()).model_dump()
+        record["created_at"] = gen._timestamp()
+        main.jobs_db.insert(record)
+
+    tenant = main.tenants.default
+    for n in range(1, sizes["cvs"] + 1):
+        text = "\n".join(gen._text(8, 16) for _ in range(CV_BYTES // 80)).encode()
+        stored = main.store_cv_file(io.BytesIO(text), tenant)
+        tenant.attach_cv(str(n), {**stored, "filename": f"cv-{n}.txt", "content_type": main.CV_CONTENT_TYPES["text"],
+                                  "uploaded_at": gen._timestamp()})
+
+    return sizes
+
+
+# ==================== Scenarios ====================
+
+class Scenario:
+    """One route under load: a method, a route template and a request factory"""
+
+    def __init__(self, name: str, method: str, route: str, make: Callable[[int], tuple],
+                 headers: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.method = method
+        self.route = route
+        self.make = make
+        self.headers = headers
+
+
+def build_scenarios(sizes: Dict[str, int], seed: int) -> List[Scenario]:
+    gen = DataGenerator(seed + 1)
+    rng = random.Random(seed + 2)
+    candidates, interviews, jobs = sizes["candidates"], sizes["interviews"], sizes["jobs"]
+
+    def any_id(count: int) -> str:
+        return str(rng.randint(1, count))
+
+    # Deletes consume the tail of the seeded candidates so every request hits a live record.
+    delete_ids = iter(range(candidates, 0, -1))
+    # Emails embed the record number and must stay unique, so bulk imports draw from their own range.
+    bulk_numbers = itertools.count(10 * candidates + 1)
+
+    def replace_candidate(count: int):
+        record_id = any_id(count)
+        return f"/api/candidates/{record_id}", gen.candidate(int(record_id))
+
+    return [
+        Scenario("root", "GET", "/", lambda i: ("/", None)),
+        Scenario("health", "GET", "/api/health", lambda i: ("/api/health", None)),
+        Scenario("list_candidates", "GET", "/api/candidates",
+                 lambda i: ("/api/candidates", None)),
+        Scenario("list_candidates_filtered", "GET", "/api/candidates",
+                 lambda i: (f"/api/candidates?status={rng.choice(CANDIDATE_STATUSES)}&limit=50", None)),
+        Scenario("get_candidate", "GET", "/api/candidates/{candidate_id}",
+                 lambda i: (f"/api/candidates/{any_id(candidates)}", None)),
+        Scenario("get_candidate_full", "GET", "/api/candidates/{candidate_id}/full",
+                 lambda i: (f"/api/candidates/{any_id(candidates)}/full", None)),
+        Scenario("download_cv", "GET", "/api/candidates/{candidate_id}/cv",
+                 lambda i: (f"/api/candidates/{any_id(sizes['cvs'])}/cv", None)),
+        Scenario("download_cv_range", "GET", "/api/candidates/{candidate_id}/cv",
+                 lambda i: (f"/api/candidates/{any_id(sizes['cvs'])}/cv", None), headers={"Range": "bytes=0-65535"}),
+        Scenario("create_candidate", "POST", "/api/candidates",
+                 lambda i: ("/api/candidates", gen.candidate(candidates + i))),
+        Scenario("update_candidate", "PUT", "/api/candidates/{candidate_id}",
+                 lambda i: replace_candidate(candidates // 2)),
+        Scenario("patch_candidate", "PATCH", "/api/candidates/{candidate_id}",
+                 lambda i: (f"/api/candidates/{any_id(candidates // 2)}",
+                            {"status": rng.choice(CANDIDATE_STATUSES)})),
+        Scenario("bulk_import_candidates", "POST", "/api/candidates/bulk",
+                 lambda i: ("/api/candidates/bulk",
+                            [gen.candidate(next(bulk_numbers)) for _ in range(50)]
+                            + [gen.candidate(int(any_id(candidates // 2)))])),
+        Scenario("search_candidates", "GET", "/api/candidates/search",
+                 lambda i: (f"/api/candidates/search?q={rng.choice(POSITIONS).split()[0]}", None)),
+        Scenario("export_candidates", "GET", "/api/candidates/export",
+                 lambda i: ("/api/candidates/export", None)),
+        Scenario("candidate_facets", "GET", "/api/candidates/facets",
+                 lambda i: (f"/api/candidates/facets?status={rng.choice(CANDIDATE_STATUSES)}"
+                            f"&position={rng.choice(POSITIONS)}", None)),
+        Scenario("duplicate_candidates", "GET", "/api/candidates/duplicates",
+                 lambda i: ("/api/candidates/duplicates", None)),
+        Scenario("list_interviews", "GET", "/api/interviews",
+                 lambda i: (f"/api/interviews?candidate_id={any_id(candidates)}", None)),
+        Scenario("create_interview", "POST", "/api/interviews",
+                 lambda i: ("/api/interviews", gen.interview(candidates))),
+        Scenario("update_interview", "PUT", "/api/interviews/{interview_id}",
+                 lambda i: (f"/api/interviews/{any_id(interviews)}", gen.interview(candidates))),
+        Scenario("patch_interview", "PATCH", "/api/interviews/{interview_id}",
+                 lambda i: (f"/api/interviews/{any_id(interviews)}",
+                            {"status": rng.choice(INTERVIEW_STATUSES)})),
+        Scenario("list_jobs", "GET", "/api/jobs",
+                 lambda i: (f"/api/jobs?status=published&department={rng.choice(DEPARTMENTS)}", None)),
+        Scenario("list_jobs_salary_range", "GET", "/api/jobs",
+                 lambda i: (f"/api/jobs?status=published&salary_min={rng.randrange(40, 90) * 1000}"
+                            f"&salary_max={rng.randrange(90, 120) * 1000}", None)),
+        Scenario("job_facets", "GET", "/api/jobs/facets",
+                 lambda i: (f"/api/jobs/facets?status=published&department={rng.choice(DEPARTMENTS)}"
+                            f"&location={rng.choice(LOCATIONS)}", None)),
+        Scenario("get_job", "GET", "/api/jobs/{job_id}",
+                 lambda i: (f"/api/jobs/{any_id(jobs)}", None)),
+        Scenario("create_job", "POST", "/api/jobs",
+                 lambda i: ("/api/jobs", gen.job())),
+        Scenario("schedule_job", "POST", "/api/jobs",
+                 lambda i: ("/api/jobs", {**gen.job(), "status": "scheduled",
+                                          "published_at": (datetime.now() + timedelta(days=1)).isoformat(),
+                                          "expires_at": (datetime.now() + timedelta(days=30)).isoformat()})),
+        Scenario("update_job", "PUT", "/api/jobs/{job_id}",
+                 lambda i: (f"/api/jobs/{any_id(jobs)}", gen.job())),
+        Scenario("patch_job", "PATCH", "/api/jobs/{job_id}",
+                 lambda i: (f"/api/jobs/{any_id(jobs)}", {"status": rng.choice(JOB_STATUSES)})),
+        Scenario("recruitment_analytics", "GET", "/api/analytics/recruitment",
+                 lambda i: ("/api/analytics/recruitment", None)),
+        Scenario("recruitment_funnel", "GET", "/api/analytics/funnel",
+                 lambda i: ("/api/analytics/funnel", None)),
+        Scenario("stage_durations", "GET", "/api/analytics/stage-durations",
+                 lambda i: ("/api/analytics/stage-durations", None)),
+        Scenario("batch_dashboard", "POST", "/api/batch",
+                 lambda i: ("/api/batch", {"requests": [
+                     {"path": "/api/candidates?limit=20"},
+                     {"path": "/api/jobs?status=published"},
+                     {"path": f"/api/interviews?candidate_id={any_id(candidates)}"},
+                     {"path": "/api/analytics/recruitment"},
+                 ]})),
+        # Destructive scenarios run last.
+        Scenario("delete_candidate", "DELETE", "/api/candidates/{candidate_id}",
+                 lambda i: (f"/api/candidates/{next(delete_ids)}", None)),
+    ]
+
+
+def uncovered_routes(scenarios: List[Scenario]) -> List[str]:
+    """Routes registered on the app that no scenario exercises"""
+    import main
+    from fastapi.routing import APIRoute
+
+    covered = {(s.method, s.route) for s in scenarios} | SKIPPED_ROUTES
+    missing = []
+    for route in main.app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        for method in sorted(route.methods):
+            if (method, route.path) not in covered:
+                missing.append(f"{method} {route.path}")
+    return missing
+
+
+# ==================== Load Driver ====================
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_scenario(client, scenario: Scenario, requests: int, concurrency: int, warmup: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(warmup + requests))
+
+    async def send(i: int, record: bool):
+        nonlocal errors
+        path, body = scenario.make(i)
+        started = time.perf_counter()
+        response = await client.request(scenario.method, path, json=body, headers=scenario.headers)
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            errors += 1
+        if record:
+            latencies.append(elapsed)
+
+    for _ in range(warmup):
+        await send(next(counter), record=False)
+
+    async def worker():
+        for i in counter:
+            await send(i, record=True)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def drive(client, scenarios: List[Scenario], args) -> Dict[str, dict]:
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = await run_scenario(client, scenario, args.requests, args.concurrency, args.warmup)
+        r = results[scenario.name]
+        print(f"  {scenario.name:<28} {r['throughput_rps']:>10.1f} req/s  "
+              f"p50 {r['p50_ms']:>8.2f}ms  p95 {r['p95_ms']:>8.2f}ms  p99 {r['p99_ms']:>8.2f}ms"
+              f"{'  errors=' + str(r['errors']) if r['errors'] else ''}")
+    return results
+
+
+async def bench_inprocess(scale: int, args) -> Dict[str, dict]:
+    import httpx
+    import main
+
+    sizes = seed_store(scale, args.seed)
+    scenarios = build_scenarios(sizes, args.seed)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        return await drive(client, scenarios, args)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def bench_uvicorn(scale: int, args) -> Dict[str, dict]:
+    import httpx
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve", "--scale", args.scale, "--seed", str(args.seed), "--port", str(port)],
+        cwd=ROOT,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+            deadline = time.monotonic() + 600
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited before becoming ready")
+                try:
+                    if (await client.get("/api/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not become ready in time")
+                await asyncio.sleep(0.25)
+            scenarios = build_scenarios(dataset_sizes(scale), args.seed)
+            return await drive(client, scenarios, args)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def serve_seeded(args):
+    """Child process entry point: seed the store, then serve it with uvicorn"""
+    import uvicorn
+    import main
+
+    seed_store(SCALES[args.scale], args.seed)
+    uvicorn.run(main.app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+
+
+# ==================== Baseline Comparison ====================
+
+def compare(current: dict, baseline: dict, max_throughput_drop: float, max_latency_increase: float) -> List[str]:
+    regressions = []
+    for transport, scenarios in current["results"].items():
+        for name, result in scenarios.items():
+            base = baseline.get("results", {}).get(transport, {}).get(name)
+            if not base:
+                continue
+            if base["throughput_rps"] and result["throughput_rps"] < base["throughput_rps"] * (1 - max_throughput_drop):
+                regressions.append(f"{transport}/{name}: throughput {result['throughput_rps']} req/s "
+                                   f"< baseline {base['throughput_rps']} req/s")
+            for key in ("p95_ms", "p99_ms"):
+                if base[key] and result[key] > base[key] * (1 + max_latency_increase):
+                    regressions.append(f"{transport}/{name}: {key} {result[key]} > baseline {base[key]}")
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--transport", choices=["inprocess", "uvicorn", "both"], default="both")
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests per route")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", type=Path, help="write results JSON to this path")
+    parser.add_argument("--baseline", type=Path, help="baseline JSON (default: scripts/benchmarks/api-<scale>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--max-throughput-drop", type=float, default=0.15)
+    parser.add_argument("--max-latency-increase", type=float, default=0.25)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=8000, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_seeded(args)
+        return 0
+
+    scale = SCALES[args.scale]
+    sizes = dataset_sizes(scale)
+    missing = uncovered_routes(build_scenarios(sizes, args.seed))
+    if missing:
+        print("WARNING: routes without a load scenario: " + ", ".join(missing))
+
+    report = {
+        "meta": {
+            "scale": args.scale,
+            "dataset": sizes,
+            "seed": args.seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": {},
+    }
+
+    transports = ["inprocess", "uvicorn"] if args.transport == "both" else [args.transport]
+    for transport in transports:
+        print(f"== {transport} (scale={args.scale}, {sizes}) ==")
+        bench = bench_inprocess if transport == "inprocess" else bench_uvicorn
+        report["results"][transport] = asyncio.run(bench(scale, args))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    baseline_path = args.baseline or DEFAULT_BASELINE_DIR / f"api-{args.scale}.json"
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2))
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare(report, json.loads(baseline_path.read_text()),
+                          args.max_throughput_drop, args.max_latency_increase)
+    if regressions:
+        print("REGRESSIONS:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print(f"No regressions against {baseline_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the storage layer behind main.py (Collection).
+
+Times the storage primitives (insert, get, update, patch, delete, filtered list,
+analytics aggregation and response serialization) across dataset sizes,
+estimates how each one scales, and measures retained memory per record.
+Results are emitted as JSON so a change to the repository layer can be gated
+on a stored baseline.
+
+Usage:
+    python scripts/benchmark-storage.py
+    python scripts/benchmark-storage.py --sizes 1000,10000,100000,1000000 --output storage.json
+    python scripts/benchmark-storage.py --save-baseline
+    python scripts/benchmark-storage.py --record-format dict   # compare against plain dict records
+"""
+
+import argparse
+import gc
+import importlib.util
+import itertools
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_BASELINE = ROOT / "scripts" / "benchmarks" / "storage.json"
+PAGE_SIZE = 100
+
+# Highest acceptable growth exponent of the per-operation cost (0 = O(1), 1 = O(n)).
+# The slack absorbs cache effects between the smallest and largest dataset.
+COMPLEXITY_BUDGET = {
+    "insert": 0.35,
+    "get": 0.35,
+    "update": 0.35,
+    "patch": 0.35,
+    "delete": 0.35,
+    "filter": 1.3,
+    "analytics": 1.3,
+    "serialize_page": 0.35,
+}
+
+
+def load_generator():
+    """Reuse the deterministic data generator of the API load test"""
+    spec = importlib.util.spec_from_file_location("benchmark_api", ROOT / "scripts" / "benchmark-api.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(fn: Callable[[], None], min_time: float, max_calls: int) -> float:
+    """Seconds per call, running fn until min_time has elapsed or max_calls is reached"""
+    calls = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time and calls < max_calls:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - started
+    return elapsed / calls
+
+
+def build_records(bench_api, size: int, seed: int) -> List[dict]:
+    import main
+
+    gen = bench_api.DataGenerator(seed)
+    records = []
+    for n in range(1, size + 1):
+        # Round-trip through JSON so every record owns its strings, as request bodies do.
+        fields = json.loads(json.dumps(gen.candidate(n)))
+        record = main.Candidate.model_construct(**fields).model_dump()
+        record["created_at"] = record["updated_at"] = gen._timestamp()
+        records.append(record)
+    return records
+
+
+def bench_size(bench_api, size: int, seed: int, min_time: float, record_format: str) -> Dict[str, dict]:
+    import main
+    from pydantic import TypeAdapter
+
+    results: Dict[str, dict] = {}
+    rng = random.Random(seed)
+    gen = bench_api.DataGenerator(seed + 1)
+
+    # Memory: bytes retained by the store per record, including the record itself.
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    # Benchmark the collection exactly as main.py configures it (indexes, listeners).
+    store = main.candidates_db
+    main.tenants.default.clear()
+    if record_format == "dict":
+        store.record_type = None
+    for record in build_records(bench_api, size, seed):
+        store.insert(record)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    tracemalloc.stop()
+    memory = {"bytes_per_record": round(retained / size, 1), "total_bytes": retained}
+
+    ids = [str(rng.randint(1, size)) for _ in range(10_000)]
+    id_iter = itertools.cycle(ids)
+
+    def op_get():
+        store.get(next(id_iter))
+
+    def op_update():
+        record_id = next(id_iter)
+        record = dict(store.get(record_id))
+        record["status"] = rng.choice(bench_api.CANDIDATE_STATUSES)
+        store.replace(record_id, record)
+
+    def op_patch():
+        store.patch(next(id_iter), {"status": rng.choice(bench_api.CANDIDATE_STATUSES)})
+
+    statuses = bench_api.CANDIDATE_STATUSES
+
+    def op_filter():
+        store.filter(limit=PAGE_SIZE, status=rng.choice(statuses), position=rng.choice(bench_api.POSITIONS))
+
+    def op_analytics():
+        store.count_by("status")
+        store.count(status="new")
+
+    page_adapter = TypeAdapter(List[main.Candidate])
+    page = store.filter(limit=PAGE_SIZE)
+
+    def op_serialize():
+        page_adapter.dump_json(page_adapter.validate_python(page))
+
+    timings = {
+        "get": measure(op_get, min_time, 200_000),
+        "update": measure(op_update, min_time, 200_000),
+        "patch": measure(op_patch, min_time, 200_000),
+        "filter": measure(op_filter, min_time, 2_000),
+        "analytics": measure(op_analytics, min_time, 2_000),
+        "serialize_page": measure(op_serialize, min_time, 20_000),
+    }
+
+    new_records = [gen.candidate(size + n) for n in range(2_000)]
+    new_iter = iter(new_records)
+    timings["insert"] = measure(lambda: store.insert(dict(next(new_iter))), min_time, len(new_records))
+
+    delete_ids = iter(rng.sample(range(1, size + 1), k=min(size, 20_000)))
+    timings["delete"] = measure(lambda: store.delete(str(next(delete_ids))), min_time, min(size, 20_000))
+
+    for op, seconds in timings.items():
+        results[op] = {"ns_per_op": round(seconds * 1e9, 1)}
+        if op == "serialize_page":
+            results[op]["ns_per_record"] = round(seconds * 1e9 / PAGE_SIZE, 1)
+    results["memory"] = memory
+    return results
+
+
+def growth_exponents(by_size: Dict[int, Dict[str, dict]]) -> Dict[str, float]:
+    """Log-log slope of ns/op between the smallest and the largest dataset"""
+    sizes = sorted(by_size)
+    if len(sizes) < 2:
+        return {}
+    small, large = sizes[0], sizes[-1]
+    exponents = {}
+    for op in by_size[small]:
+        if op == "memory":
+            continue
+        a, b = by_size[small][op]["ns_per_op"], by_size[large][op]["ns_per_op"]
+        exponents[op] = round(math.log(b / a) / math.log(large / small), 3) if a and b else 0.0
+    return exponents
+
+
+def check(report: dict, baseline: dict, max_slowdown: float, max_memory_growth: float) -> List[str]:
+    failures = []
+    for op, exponent in report["complexity"].items():
+        budget = COMPLEXITY_BUDGET.get(op)
+        if budget is not None and exponent > budget:
+            failures.append(f"{op}: growth exponent {exponent} exceeds budget {budget}")
+
+    for size, ops in report["results"].items():
+        base_ops = baseline.get("results", {}).get(size)
+        if not base_ops:
+            continue
+        for op, result in ops.items():
+            base = base_ops.get(op)
+            if not base:
+                continue
+            if op == "memory":
+                if result["bytes_per_record"] > base["bytes_per_record"] * (1 + max_memory_growth):
+                    failures.append(f"n={size} memory: {result['bytes_per_record']} B/record "
+                                    f"> baseline {base['bytes_per_record']} B/record")
+            elif result["ns_per_op"] > base["ns_per_op"] * (1 + max_slowdown):
+                failures.append(f"n={size} {op}: {result['ns_per_op']} ns/op > baseline {base['ns_per_op']} ns/op")
+    return failures
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds spent timing each operation")
+    parser.add_argument("--output", type=Path, help="write results JSON to this path (default: stdout)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--max-slowdown", type=float, default=0.25)
+    parser.add_argument("--max-memory-growth", type=float, default=0.10)
+    parser.add_argument("--record-format", choices=["compact", "dict"], default="compact",
+                        help="store records as configured in main.py (compact) or as plain dicts")
+    args = parser.parse_args()
+
+    bench_api = load_generator()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    by_size = {}
+    for size in sizes:
+        by_size[size] = bench_size(bench_api, size, args.seed, args.min_time, args.record_format)
+        summary = "  ".join(f"{op}={r['ns_per_op']:.0f}ns" for op, r in by_size[size].items() if op != "memory")
+        print(f"n={size:<9} {summary}  memory={by_size[size]['memory']['bytes_per_record']}B/record",
+              file=sys.stderr)
+
+    report = {
+        "meta": {
+            "sizes": sizes,
+            "seed": args.seed,
+            "record_format": args.record_format,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": {str(size): ops for size, ops in by_size.items()},
+        "complexity": growth_exponents(by_size),
+    }
+    encoded = json.dumps(report, indent=2)
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(encoded)
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr)
+    if args.output:
+        args.output.write_text(encoded)
+    else:
+        print(encoded)
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() and not args.save_baseline else {}
+    failures = check(report, baseline, args.max_slowdown, args.max_memory_growth)
+    if failures:
+        print("STORAGE REGRESSIONS:", file=sys.stderr)
+        for line in failures:
+            print(f"  - {line}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())